@@ -7,7 +7,6 @@ import streamlit as st
 import pandas as pd
 import io
 from datetime import datetime
-from typing import Optional, Dict, Any
 
 # ==========================================
 # 🔒 AUTHENTIFICATION 
@@ -157,35 +156,6 @@ def init_session_state():
             st.session_state[key] = value
 
 
-def load_any_file(uploaded_file) -> Optional[pd.DataFrame]:
-    """Charge n'importe quel type de fichier supporté"""
-    if uploaded_file is None:
-        return None
-    
-    try:
-        uploaded_file.seek(0)
-    except:
-        pass
-    
-    name = uploaded_file.name.lower()
-    
-    try:
-        if name.endswith('.csv'):
-            return pd.read_csv(uploaded_file)
-        elif name.endswith(('.xlsx', '.xls')):
-            return pd.read_excel(uploaded_file)
-        elif name.endswith('.json'):
-            return pd.read_json(uploaded_file)
-        elif name.endswith('.parquet'):
-            return pd.read_parquet(uploaded_file)
-        else:
-            st.error(f"❌ Format non supporté: {name}")
-            return None
-    except Exception as e:
-        st.error(f"❌ Erreur lors du chargement: {str(e)}")
-        return None
-
-
 def reset_analysis_on_new_file(current_name: str):
     """Reset l'analyse si nouveau fichier"""
     if st.session_state._last_uploaded_name != current_name:
@@ -422,7 +392,7 @@ if st.session_state.df is None:
         else "Loading and cleaning data..."
     ):
         try:
-            df_raw = load_any_file(uploaded_file)
+            df_raw = load_file(uploaded_file)
             if df_raw is None:
                 st.stop()
             
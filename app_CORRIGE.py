@@ -947,13 +947,16 @@ with tab4:
             # ✅ NOUVEAU : Ajouter au contexte
             analysis['anomaly_report'] = anomaly_report
                         
-            # Générer avec Ollama
+            # Générer avec Ollama (barre de progression alimentée par le streaming)
+            progress_bar = st.progress(0.0)
             raw_insights = llm_insights_local(
                 df,
                 analysis,
                 lang=st.session_state.report_lang,
-                model=selected_model
+                model=selected_model,
+                progress_callback=progress_bar.progress
             )
+            progress_bar.empty()
         elif ai_mode == "Ollama (Local)" and not selected_model:
                 st.warning(
                     "⚠️ Sélectionnez un modèle dans la barre latérale" 
@@ -1016,12 +1019,15 @@ with tab4:
                                     else f"⏳ Model {selected_model} may be slow (3-5 min). Be patient!"
                                 )
                         
+                        progress_bar = st.progress(0.0)
                         raw_insights = llm_insights_local(
                             df,
                             analysis,
                             lang=st.session_state.report_lang,
-                            model=selected_model
+                            model=selected_model,
+                            progress_callback=progress_bar.progress
                         )
+                        progress_bar.empty()
                         
                         st.session_state.ai_insights = normalize_insights_for_report(raw_insights)
                     
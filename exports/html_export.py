@@ -5,18 +5,15 @@ Avec graphiques intégrés en base64
 
 from datetime import datetime
 import base64
-from io import BytesIO
 from typing import Dict, Any, Optional
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
+from utils.visualizations import figure_to_png
 
-def fig_to_base64(fig: plt.Figure) -> str:
+
+def fig_to_base64(fig: Figure) -> str:
     """Convertit une figure matplotlib en string base64"""
-    buffer = BytesIO()
-    fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.read()).decode()
-    plt.close(fig)
+    image_base64 = base64.b64encode(figure_to_png(fig, dpi=150)).decode()
     return f"data:image/png;base64,{image_base64}"
 
 
@@ -388,7 +385,7 @@ def generate_html_report(df, analysis: Dict[str, Any], ai_insights: Dict[str, An
             </thead>
             <tbody>
 """
-        for col in analysis['numeric_cols'][:15]:
+        for col in analysis['numeric_stats'].columns[:15]:
             try:
                 stats = analysis['numeric_stats'][col]
                 html += f"""
@@ -8,10 +8,12 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from datetime import datetime
 import io
 from typing import Dict, Any, Optional
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
+from utils.visualizations import figure_to_png
 
-def add_figure_to_doc(doc: Document, fig: plt.Figure, width: float = 6.0):
+
+def add_figure_to_doc(doc: Document, fig: Figure, width: float = 6.0):
     """
     Ajoute une figure matplotlib au document Word
     
@@ -21,14 +23,11 @@ def add_figure_to_doc(doc: Document, fig: plt.Figure, width: float = 6.0):
         width: Largeur en inches
     """
     try:
-        # Sauvegarder la figure dans un buffer
-        buffer = io.BytesIO()
-        fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-        buffer.seek(0)
+        # PNG partagé avec l'export HTML (pas de nouveau rendu)
+        buffer = io.BytesIO(figure_to_png(fig, dpi=150))
         
         # Ajouter au document
         doc.add_picture(buffer, width=Inches(width))
-        plt.close(fig)
         
     except Exception as e:
         print(f"Error adding figure to Word doc: {e}")
@@ -181,7 +180,7 @@ def generate_word_report(df, analysis: Dict[str, Any], ai_insights: Dict[str, An
                     run.font.size = Pt(9)
         
         # Données (max 15 variables)
-        for col in analysis['numeric_cols'][:15]:
+        for col in analysis['numeric_stats'].columns[:15]:
             try:
                 stats = analysis['numeric_stats'][col]
                 row_cells = table.add_row().cells
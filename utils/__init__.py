@@ -4,8 +4,8 @@ Module utils - Imports centralisés pour l'analyse de données
 
 from .data_loader import load_file
 from .data_cleaner import clean_and_preprocess, get_data_quality_score
-from .analyzer import analyze_dataframe
-from .visualizations import create_visualizations
+from .analyzer import analyze_dataframe, analyze_source
+from .visualizations import create_visualizations, figure_to_png
 from .ai_insights import (
     generate_ai_insights,      # API Anthropic
     llm_insights_local,        # Ollama
@@ -29,9 +29,11 @@ __all__ = [
     
     # Analysis
     'analyze_dataframe',
+    'analyze_source',
     
     # Visualizations
     'create_visualizations',
+    'figure_to_png',
     
     # AI Insights
     'generate_basic_insights',
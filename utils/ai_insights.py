@@ -7,7 +7,7 @@ VERSION FINALE : Haiku + Contexte Anomalies + Switch facile Sonnet
 import json
 import requests
 import pandas as pd
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Callable
 
 # ==========================================
 # ✅ CONFIGURATION DU MODÈLE ANTHROPIC
@@ -284,7 +284,8 @@ def test_api_key(api_key: str) -> Tuple[bool, str]:
 # ==========================================
 
 def llm_insights_local(df: pd.DataFrame, analysis: Dict[str, Any], 
-                      lang: str = 'fr', model: str = 'llama3.2:3b') -> Dict[str, Any]:
+                      lang: str = 'fr', model: str = 'llama3.2:3b',
+                      progress_callback: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
     """
     Génère des insights avec un LLM local (Ollama)
     ✅ Intègre le rapport d'anomalies si disponible
@@ -294,6 +295,7 @@ def llm_insights_local(df: pd.DataFrame, analysis: Dict[str, Any],
         analysis: Dictionnaire d'analyse de base (peut contenir 'anomaly_report')
         lang: Langue ('fr' ou 'en')
         model: Nom du modèle Ollama à utiliser
+        progress_callback: Optionnel, reçoit l'avancement 0-1 (ex. st.progress(...).progress)
         
     Returns:
         dict: Insights au format standard
@@ -355,29 +357,17 @@ Réponds UNIQUEMENT avec un objet JSON (pas de texte avant ou après, pas de mar
 }}"""
         
         # Appeler Ollama
-        from utils.local_llm import get_model_timeout
+        # Streaming : timeout reste une limite de durée totale
+        from utils.local_llm import get_model_timeout, stream_ollama_generate
         timeout = get_model_timeout(model)
         
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "format": "json",
-                "options": {
-                    "temperature": 0.7,
-                    "num_predict": 2000
-                }
-            },
-            timeout=timeout
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Ollama returned status {response.status_code}")
-        
-        result = response.json()
-        text = result.get('response', '{}').strip()
+        text = stream_ollama_generate(
+            model,
+            prompt,
+            {"temperature": 0.7, "num_predict": 2000},
+            timeout,
+            progress_callback
+        ) or '{}'
         
         # Nettoyer le JSON
         if text.startswith('```json'):
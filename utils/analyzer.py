@@ -3,9 +3,12 @@ Module d'analyse statistique des données
 Version améliorée avec analyses détaillées
 """
 
+import os
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 
 def analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
@@ -33,35 +36,32 @@ def analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     analysis['datetime_cols'] = list(df.select_dtypes(include=['datetime64']).columns)
     analysis['boolean_cols'] = list(df.select_dtypes(include=['bool']).columns)
     
+    # Colonnes constantes ou entièrement vides : rien à calculer dessus
+    # (toujours signalées dans column_uniqueness et missing_values)
+    try:
+        nunique = df.nunique(dropna=True)
+    except TypeError:
+        # Valeurs non hachables (listes, dicts issus du JSON)
+        nunique = df.astype(str).where(df.notna()).nunique(dropna=True)
+    active_numeric = [col for col in analysis['numeric_cols'] if nunique[col] > 1]
+    
     # ==========================================
     # 2. STATISTIQUES NUMÉRIQUES
     # ==========================================
-    if analysis['numeric_cols']:
-        analysis['numeric_stats'] = df[analysis['numeric_cols']].describe()
+    if active_numeric:
+        analysis['numeric_stats'] = df[active_numeric].describe()
         
         # Statistiques supplémentaires
-        analysis['numeric_summary'] = {}
-        for col in analysis['numeric_cols']:
-            try:
-                data = df[col].dropna()
-                
-                if len(data) > 0:
-                    analysis['numeric_summary'][col] = {
-                        'count': int(data.count()),
-                        'mean': float(data.mean()),
-                        'median': float(data.median()),
-                        'std': float(data.std()),
-                        'min': float(data.min()),
-                        'max': float(data.max()),
-                        'q1': float(data.quantile(0.25)),
-                        'q3': float(data.quantile(0.75)),
-                        'skewness': float(data.skew()),
-                        'kurtosis': float(data.kurtosis()),
-                        'missing': int(df[col].isnull().sum()),
-                        'missing_pct': float((df[col].isnull().sum() / len(df)) * 100)
-                    }
-            except Exception as e:
-                print(f"Error analyzing {col}: {e}")
+        # Matrice float64 : entiers exacts jusqu'à 2**53 (comme describe() / numeric_stats)
+        X = df[active_numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        summaries = _map_columns(
+            lambda j: _summary_one_col(active_numeric[j], X[:, j]),
+            range(len(active_numeric))
+        )
+        analysis['numeric_summary'] = {
+            col: summary for col, summary in zip(active_numeric, summaries) if summary
+        }
     else:
         analysis['numeric_stats'] = pd.DataFrame()
         analysis['numeric_summary'] = {}
@@ -72,23 +72,14 @@ def analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     analysis['category_dist'] = {}
     analysis['categorical_summary'] = {}
     
-    for col in analysis['categorical_cols'][:10]:  # Limiter aux 10 premières
-        try:
-            # Distribution
-            value_counts = df[col].value_counts().head(10)
-            analysis['category_dist'][col] = value_counts.to_dict()
-            
-            # Résumé
-            analysis['categorical_summary'][col] = {
-                'unique_count': int(df[col].nunique()),
-                'most_common': str(df[col].mode()[0]) if len(df[col].mode()) > 0 else None,
-                'most_common_freq': int(df[col].value_counts().iloc[0]) if len(df[col]) > 0 else 0,
-                'missing': int(df[col].isnull().sum()),
-                'missing_pct': float((df[col].isnull().sum() / len(df)) * 100),
-                'top_values': [(str(k), int(v)) for k, v in value_counts.head(5).items()]
-            }
-        except Exception as e:
-            print(f"Error analyzing category {col}: {e}")
+    categorical_cols = analysis['categorical_cols'][:10]  # Limiter aux 10 premières
+    results = _map_columns(
+        lambda col: _categorical_one_col(col, df[col], int(nunique[col])),
+        categorical_cols
+    )
+    for col, result in zip(categorical_cols, results):
+        if result:
+            analysis['category_dist'][col], analysis['categorical_summary'][col] = result
     
     # ==========================================
     # 4. VALEURS MANQUANTES GLOBALES
@@ -105,9 +96,9 @@ def analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     # ==========================================
     # 5. CORRÉLATIONS (si > 2 colonnes numériques)
     # ==========================================
-    if len(analysis['numeric_cols']) >= 2:
+    if len(active_numeric) >= 2:
         try:
-            corr_matrix = df[analysis['numeric_cols']].corr()
+            corr_matrix = df[active_numeric].corr()
             
             # Trouver les corrélations les plus fortes
             correlations = []
@@ -139,29 +130,14 @@ def analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     # ==========================================
     analysis['outliers'] = {}
     
-    for col in analysis['numeric_cols'][:20]:  # Limiter pour performance
-        try:
-            data = df[col].dropna()
-            
-            if len(data) > 0:
-                Q1 = data.quantile(0.25)
-                Q3 = data.quantile(0.75)
-                IQR = Q3 - Q1
-                
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)][col]
-                
-                if len(outliers) > 0:
-                    analysis['outliers'][col] = {
-                        'count': int(len(outliers)),
-                        'percentage': float((len(outliers) / len(df)) * 100),
-                        'lower_bound': float(lower_bound),
-                        'upper_bound': float(upper_bound)
-                    }
-        except Exception as e:
-            print(f"Error detecting outliers in {col}: {e}")
+    outlier_cols = active_numeric[:20]  # Limiter pour performance
+    results = _map_columns(
+        lambda col: _outliers_one_col(col, df[col].to_numpy(dtype=np.float64, na_value=np.nan)),
+        outlier_cols
+    )
+    for col, result in zip(outlier_cols, results):
+        if result:
+            analysis['outliers'][col] = result
     
     # ==========================================
     # 7. UNICITÉ DES COLONNES
@@ -170,7 +146,7 @@ def analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     
     for col in df.columns[:30]:  # Limiter pour performance
         try:
-            unique_count = df[col].nunique()
+            unique_count = nunique[col]
             total_count = len(df)
             
             analysis['column_uniqueness'][col] = {
@@ -200,6 +176,373 @@ def analyze_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
     return analysis
 
 
+def _map_columns(func, items) -> List[Any]:
+    """
+    Applique func à chaque colonne sur un pool de threads
+    Les noyaux NumPy/pandas libèrent le GIL : le travail par colonne se parallélise
+    """
+    items = list(items)
+    if len(items) < 2:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(len(items), os.cpu_count() or 1)) as executor:
+        return list(executor.map(func, items))
+
+
+def _summary_one_col(col: str, col_data: np.ndarray) -> Optional[Dict[str, Any]]:
+    """Statistiques d'une colonne numérique (vue float64 de la matrice)"""
+    try:
+        data = col_data[~np.isnan(col_data)]
+        if len(data) == 0:
+            return None
+
+        q1, median, q3 = np.quantile(data, [0.25, 0.5, 0.75])
+        moments = _column_moments(data)
+        missing = len(col_data) - len(data)
+
+        return {
+            'count': int(len(data)),
+            'mean': float(moments['mean']),
+            'median': float(median),
+            'std': float(moments['std']),
+            'min': float(data.min()),
+            'max': float(data.max()),
+            'q1': float(q1),
+            'q3': float(q3),
+            'skewness': float(moments['skewness']),
+            'kurtosis': float(moments['kurtosis']),
+            'missing': int(missing),
+            'missing_pct': float((missing / len(col_data)) * 100)
+        }
+    except Exception as e:
+        print(f"Error analyzing {col}: {e}")
+        return None
+
+
+def _categorical_one_col(col: str, series: pd.Series, unique_count: int) -> Optional[Tuple[Dict, Dict]]:
+    """Distribution et résumé d'une colonne catégorielle"""
+    try:
+        counts = series.value_counts()
+        value_counts = counts.head(10)
+
+        summary = {
+            'unique_count': unique_count,
+            'most_common': str(counts.index[0]) if len(counts) > 0 else None,
+            'most_common_freq': int(counts.iloc[0]) if len(counts) > 0 else 0,
+            'missing': int(series.isnull().sum()),
+            'missing_pct': float((series.isnull().sum() / len(series)) * 100),
+            'top_values': [(str(k), int(v)) for k, v in value_counts.head(5).items()]
+        }
+        return value_counts.to_dict(), summary
+    except Exception as e:
+        print(f"Error analyzing category {col}: {e}")
+        return None
+
+
+def _outliers_one_col(col: str, col_data: np.ndarray) -> Optional[Dict[str, float]]:
+    """Outliers d'une colonne numérique (méthode IQR)"""
+    try:
+        data = col_data[~np.isnan(col_data)]
+        if len(data) == 0:
+            return None
+
+        Q1, Q3 = np.quantile(data, [0.25, 0.75])
+        IQR = Q3 - Q1
+
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+
+        count = int(np.count_nonzero((data < lower_bound) | (data > upper_bound)))
+        if count == 0:
+            return None
+
+        return {
+            'count': count,
+            'percentage': float((count / len(col_data)) * 100),
+            'lower_bound': float(lower_bound),
+            'upper_bound': float(upper_bound)
+        }
+    except Exception as e:
+        print(f"Error detecting outliers in {col}: {e}")
+        return None
+
+
+def analyze_source(src: Union[str, Path, pd.DataFrame, Any]) -> Dict[str, Any]:
+    """
+    Analyse depuis un DataFrame pandas, un fichier Parquet/Arrow IPC ou un LazyFrame Polars
+
+    Pour un chemin ou un LazyFrame, toutes les agrégations sont construites en un
+    plan lazy Polars exécuté en streaming : les lignes ne sont jamais matérialisées.
+
+    Args:
+        src: DataFrame pandas, chemin (.parquet, .arrow/.feather/.ipc) ou pl.LazyFrame
+
+    Returns:
+        dict: Même structure que analyze_dataframe()
+
+    Raises:
+        ImportError: polars n'est pas installé (source autre qu'un DataFrame pandas)
+    """
+    if isinstance(src, pd.DataFrame):
+        return analyze_dataframe(src)
+
+    pl = _import_polars()
+
+    if isinstance(src, (str, Path)):
+        if str(src).lower().endswith('.parquet'):
+            lf = pl.scan_parquet(src)
+        else:
+            lf = pl.scan_ipc(src)  # Arrow IPC : mmap par défaut
+    else:
+        lf = src
+
+    return _analyze_lazy(lf)
+
+
+def _import_polars():
+    """Import de polars, dépendance optionnelle (uniquement pour les sources lazy)"""
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError(
+            "install polars to analyze Parquet/Arrow sources (pip install polars)"
+        ) from e
+    return pl
+
+
+def _analyze_lazy(lf) -> Dict[str, Any]:
+    """Version streaming de analyze_dataframe() pour un pl.LazyFrame"""
+    pl = _import_polars()
+
+    schema = lf.collect_schema()
+    columns = schema.names()
+
+    analysis = {}
+    analysis['columns'] = columns
+    analysis['dtypes'] = {col: str(dtype) for col, dtype in schema.items()}
+    analysis['numeric_cols'] = [col for col, dtype in schema.items() if dtype.is_numeric()]
+    analysis['categorical_cols'] = [
+        col for col, dtype in schema.items() if dtype in (pl.String, pl.Categorical, pl.Enum)
+    ]
+    analysis['datetime_cols'] = [col for col, dtype in schema.items() if dtype == pl.Datetime]
+    analysis['boolean_cols'] = [col for col, dtype in schema.items() if dtype == pl.Boolean]
+
+    # ==========================================
+    # PASSE 1 : comptages + statistiques numériques
+    # ==========================================
+    aggs = [pl.len().alias('__rows')]
+    for i, col in enumerate(columns):
+        c = pl.col(col)
+        aggs += [
+            c.null_count().alias(f'{i}|missing'),
+            c.drop_nulls().n_unique().alias(f'{i}|nunique'),
+        ]
+        if col in analysis['numeric_cols']:
+            aggs += [
+                c.count().alias(f'{i}|count'),
+                c.mean().alias(f'{i}|mean'),
+                c.std().alias(f'{i}|std'),
+                c.min().cast(pl.Float64).alias(f'{i}|min'),
+                c.quantile(0.25, interpolation='linear').alias(f'{i}|q1'),
+                c.median().alias(f'{i}|median'),
+                c.quantile(0.75, interpolation='linear').alias(f'{i}|q3'),
+                c.max().cast(pl.Float64).alias(f'{i}|max'),
+                c.skew(bias=False).alias(f'{i}|skewness'),
+                c.kurtosis(bias=False).alias(f'{i}|kurtosis'),
+            ]
+
+    # Distributions catégorielles (même plan, scan partagé)
+    cat_cols = analysis['categorical_cols'][:10]
+    plans = [lf.select(aggs)]
+    for col in cat_cols:
+        plans.append(
+            lf.select(pl.col(col).cast(pl.String)).drop_nulls()
+            .group_by(col).len()
+            .sort('len', descending=True)
+            .head(10)
+        )
+
+    results = pl.collect_all(plans, engine='streaming')
+    row = results[0].row(0, named=True)
+
+    n_rows = int(row['__rows'])
+    analysis['shape'] = (n_rows, len(columns))
+
+    def stat(col, name):
+        return row[f'{columns.index(col)}|{name}']
+
+    nunique = {col: int(stat(col, 'nunique')) for col in columns}
+    missing = {col: int(stat(col, 'missing')) for col in columns}
+    active_numeric = [col for col in analysis['numeric_cols'] if nunique[col] > 1]
+
+    # ==========================================
+    # STATISTIQUES NUMÉRIQUES
+    # ==========================================
+    analysis['numeric_summary'] = {}
+    for col in active_numeric:
+        if stat(col, 'count') > 0:
+            summary = {
+                key: float(stat(col, key)) if stat(col, key) is not None else np.nan
+                for key in ('mean', 'median', 'std', 'min', 'max', 'q1', 'q3', 'skewness', 'kurtosis')
+            }
+            summary['count'] = int(stat(col, 'count'))
+            summary['missing'] = missing[col]
+            summary['missing_pct'] = float(missing[col] / n_rows * 100) if n_rows else 0.0
+            analysis['numeric_summary'][col] = summary
+
+    describe_rows = [('count', 'count'), ('mean', 'mean'), ('std', 'std'), ('min', 'min'),
+                     ('25%', 'q1'), ('50%', 'median'), ('75%', 'q3'), ('max', 'max')]
+    analysis['numeric_stats'] = pd.DataFrame(
+        {col: [analysis['numeric_summary'][col][key] for _, key in describe_rows]
+         for col in analysis['numeric_summary']},
+        index=[label for label, _ in describe_rows]
+    )
+
+    # ==========================================
+    # DISTRIBUTION DES CATÉGORIES
+    # ==========================================
+    analysis['category_dist'] = {}
+    analysis['categorical_summary'] = {}
+    for col, counts in zip(cat_cols, results[1:]):
+        top = list(zip(counts[col].to_list(), counts['len'].to_list()))
+        analysis['category_dist'][col] = dict(top)
+        analysis['categorical_summary'][col] = {
+            'unique_count': nunique[col],
+            'most_common': str(top[0][0]) if top else None,
+            'most_common_freq': int(top[0][1]) if top else 0,
+            'missing': missing[col],
+            'missing_pct': float(missing[col] / n_rows * 100) if n_rows else 0.0,
+            'top_values': [(str(k), int(v)) for k, v in top[:5]]
+        }
+
+    # ==========================================
+    # VALEURS MANQUANTES
+    # ==========================================
+    analysis['missing_values'] = {
+        col: {'count': count, 'percentage': float(count / n_rows * 100)}
+        for col, count in missing.items() if count > 0
+    }
+
+    # ==========================================
+    # PASSE 2 : corrélations + outliers (bornes IQR de la passe 1)
+    # ==========================================
+    pairs = [
+        (col1, col2)
+        for i, col1 in enumerate(active_numeric)
+        for col2 in active_numeric[i + 1:]
+    ]
+    outlier_cols = [col for col in active_numeric[:20] if col in analysis['numeric_summary']]
+    bounds = {}
+    for col in outlier_cols:
+        q1 = analysis['numeric_summary'][col]['q1']
+        q3 = analysis['numeric_summary'][col]['q3']
+        bounds[col] = (q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+
+    second = []
+    for k, (col1, col2) in enumerate(pairs):
+        both = pl.col(col1).is_not_null() & pl.col(col2).is_not_null()
+        second.append(
+            pl.corr(pl.col(col1).filter(both), pl.col(col2).filter(both)).alias(f'corr|{k}')
+        )
+    for k, col in enumerate(outlier_cols):
+        lower, upper = bounds[col]
+        second.append(
+            ((pl.col(col) < lower) | (pl.col(col) > upper)).sum().alias(f'out|{k}')
+        )
+
+    row2 = lf.select(second).collect(engine='streaming').row(0, named=True) if second else {}
+
+    correlations = [
+        {'col1': col1, 'col2': col2, 'correlation': float(row2[f'corr|{k}'])}
+        for k, (col1, col2) in enumerate(pairs)
+        if row2[f'corr|{k}'] is not None and not np.isnan(row2[f'corr|{k}'])
+    ]
+    correlations.sort(key=lambda x: abs(x['correlation']), reverse=True)
+    analysis['top_correlations'] = correlations[:10]
+
+    analysis['outliers'] = {}
+    for k, col in enumerate(outlier_cols):
+        count = int(row2[f'out|{k}'])
+        if count > 0:
+            analysis['outliers'][col] = {
+                'count': count,
+                'percentage': float(count / n_rows * 100),
+                'lower_bound': float(bounds[col][0]),
+                'upper_bound': float(bounds[col][1])
+            }
+
+    # ==========================================
+    # UNICITÉ + MÉTADONNÉES
+    # ==========================================
+    analysis['column_uniqueness'] = {
+        col: {
+            'unique_count': nunique[col],
+            'uniqueness_ratio': float(nunique[col] / n_rows if n_rows > 0 else 0),
+            'is_unique': bool(nunique[col] == n_rows),
+            'is_constant': bool(nunique[col] == 1)
+        }
+        for col in columns[:30]
+    }
+
+    total_missing = sum(missing.values())
+    analysis['metadata'] = {
+        'total_rows': n_rows,
+        'total_columns': len(columns),
+        'memory_usage_mb': None,  # Données non matérialisées
+        'numeric_columns_count': len(analysis['numeric_cols']),
+        'categorical_columns_count': len(analysis['categorical_cols']),
+        'datetime_columns_count': len(analysis['datetime_cols']),
+        'boolean_columns_count': len(analysis['boolean_cols']),
+        'total_missing_values': total_missing,
+        'missing_values_percentage': float(total_missing / (n_rows * len(columns)) * 100)
+            if n_rows and columns else 0.0
+    }
+
+    return analysis
+
+
+def _column_moments(data: np.ndarray) -> Dict[str, float]:
+    """
+    Calcule moyenne, écart-type, skewness et kurtosis en une passe
+    Accumule en float64 (stabilité numérique)
+    Mêmes conventions que pandas (estimateurs non biaisés)
+
+    Args:
+        data: Valeurs non manquantes d'une colonne
+
+    Returns:
+        dict: mean, std, skewness, kurtosis
+    """
+    n = len(data)
+    mean = data.mean(dtype=np.float64)
+    dev = data - mean  # promu en float64
+    dev2 = dev * dev
+    m2 = dev2.sum()
+    m3 = (dev2 * dev).sum()
+    m4 = (dev2 * dev2).sum()
+
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+
+    if n < 3:
+        skewness = np.nan
+    elif m2 == 0:
+        skewness = 0.0
+    else:
+        skewness = (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2 ** 1.5)
+
+    if n < 4:
+        kurtosis = np.nan
+    elif m2 == 0:
+        kurtosis = 0.0
+    else:
+        kurtosis = (
+            n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2)
+            - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        )
+
+    return {'mean': mean, 'std': std, 'skewness': skewness, 'kurtosis': kurtosis}
+
+
 def get_column_recommendations(df: pd.DataFrame, analysis: Dict[str, Any]) -> List[str]:
     """
     Génère des recommandations basées sur l'analyse
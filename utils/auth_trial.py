@@ -1,34 +1,105 @@
 """
 Système d'authentification avec essai gratuit et auto-inscription
 Version complète avec traductions FR/EN
+
+Hachage :
+- mots de passe : bcrypt uniquement (SHA-256 accepté en lecture pour l'existant)
 """
 
 import streamlit as st
+import bcrypt
 import hashlib
+import hmac
 import json
+from collections import ChainMap
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+__all__ = [
+    # Utilisateurs
+    'load_users_db',
+    'reload_users_db',
+    'get_user',
+    'hash_password',
+    'password_too_long',
+    'verify_password',
+    'save_new_user',
+    'user_exists',
+    'get_user_from_all_sources',
+    
+    # Connexion / session
+    'check_login',
+    'logout',
+    
+    # Quota
+    'QuotaView',
+    'can_generate_report',
+    'increment_report_count',
+    'flush_report_count',
+    'get_quota_info',
+    'show_quota_sidebar',
+    'show_upgrade_message',
+]
 
 # ==========================================
 # BASE DE DONNÉES SIMPLE (Fichier JSON)
 # En production : Supabase/Firebase
 # ==========================================
 
+# Caches Streamlit toujours bornés (ttl + max_entries) : sur Streamlit Cloud
+# multi-utilisateurs, un cache sans limite fait grossir la mémoire du processus
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
 def load_users_db() -> Dict:
-    """Charge la base de données des utilisateurs depuis les secrets"""
+    """Charge la base de données des utilisateurs depuis les secrets (cache 5 min)"""
     try:
-        return st.secrets.get("users_db", {})
+        return {
+            email: dict(user)
+            for email, user in st.secrets.get("users_db", {}).items()
+        }
     except:
         return {}
 
+def reload_users_db():
+    """Force la relecture des utilisateurs (après modification des secrets)"""
+    load_users_db.clear()
+    st.session_state.pop("_users_view", None)
+
 def get_user(email: str) -> Optional[Dict]:
     """Récupère un utilisateur"""
     users_db = load_users_db()
     return users_db.get(email)
 
+# bcrypt ne lit que 72 octets (bcrypt 5 lève ValueError au-delà) : plus long = refusé
+BCRYPT_MAX_BYTES = 72
+
+def password_too_long(password: str) -> bool:
+    """True si le mot de passe dépasse la limite bcrypt (en octets UTF-8)"""
+    return len(password.encode()) > BCRYPT_MAX_BYTES
+
 def hash_password(password: str) -> str:
-    """Hash un mot de passe"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash un mot de passe (bcrypt, sel aléatoire)"""
+    if password_too_long(password):
+        raise ValueError(f"password longer than {BCRYPT_MAX_BYTES} bytes")
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+
+# Hash bcrypt factice (même coût que gensalt() par défaut) : vérifié quand l'utilisateur
+# n'existe pas, pour que le temps de réponse ne révèle pas les emails inscrits
+_DUMMY_BCRYPT_HASH = b"$2b$12$w/PV6S.AQc95mRdNiu6JmejNkutz1OPuQq99vo0rJ5WK5z0yvOsB6"
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    """
+    Vérifie un mot de passe contre son hash
+    Accepte encore les anciens hash SHA-256 (secrets pas encore migrés)
+    """
+    if not password_hash or (password_hash.startswith("$2") and password_too_long(password)):
+        # Utilisateur inconnu / sans hash / mot de passe trop long : même coût bcrypt,
+        # toujours refusé (tronqué à 72 octets : bcrypt 5 refuse au-delà)
+        bcrypt.checkpw(password.encode()[:BCRYPT_MAX_BYTES], _DUMMY_BCRYPT_HASH)
+        return False
+    if password_hash.startswith("$2"):
+        return bcrypt.checkpw(password.encode(), password_hash.encode())
+    return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), password_hash)
 
 
 # ==========================================
@@ -65,39 +136,70 @@ def save_new_user(email: str, password_hash: str, lang: str = 'fr') -> bool:
     return True
 
 
+def get_users_view() -> ChainMap:
+    """
+    Vue fusionnée de tous les utilisateurs, construite une fois par session
+    Les secrets (pré-configurés) sont prioritaires sur les nouveaux inscrits
+    """
+    if "_users_view" not in st.session_state:
+        st.session_state["_users_view"] = ChainMap(
+            load_users_db(),
+            st.session_state.setdefault("registered_users", {}),
+        )
+    return st.session_state["_users_view"]
+
+
 def user_exists(email: str) -> bool:
     """Vérifie si un utilisateur existe déjà"""
-    # Vérifier dans secrets
-    if get_user(email):
-        return True
-    
-    # Vérifier dans les nouveaux inscrits (session)
-    if "registered_users" in st.session_state:
-        if email in st.session_state.registered_users:
-            return True
-    
-    return False
+    return email in get_users_view()
 
 
 def get_user_from_all_sources(email: str) -> Optional[Dict]:
     """Récupère un utilisateur depuis toutes les sources"""
-    # D'abord les secrets (utilisateurs pré-configurés)
-    user = get_user(email)
-    if user:
-        return user
-    
-    # Ensuite les nouveaux inscrits (session)
-    if "registered_users" in st.session_state:
-        if email in st.session_state.registered_users:
-            return st.session_state.registered_users[email]
-    
-    return None
+    return get_users_view().get(email)
 
 
 # ==========================================
 # AUTHENTIFICATION
 # ==========================================
 
+_LOGIN_CSS = """
+<style>
+    .login-container {
+        max-width: 500px;
+        margin: 0 auto;
+        padding: 2rem;
+    }
+    .login-header {
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .trial-badge {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 1rem;
+        border-radius: 10px;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+</style>
+"""
+
+_LOGIN_HEADER_HTML = """<div class="login-container">
+<div class="login-header">
+<h1>{title}</h1>
+<p><strong>{app_name}</strong></p>
+</div>
+<div class="trial-badge">
+    <h3 style="margin: 0; color: white;">{badge_title}</h3>
+    <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem;">
+        <strong>{badge_text}</strong>
+    </p>
+</div>
+</div>
+"""
+
+
 def check_login() -> bool:
     """
     Vérifie l'authentification avec auto-inscription
@@ -131,6 +233,7 @@ def check_login() -> bool:
             'error_invalid_email': 'Email invalide',
             'error_password_mismatch': 'Les mots de passe ne correspondent pas',
             'error_password_short': 'Le mot de passe doit contenir au moins 6 caractères',
+            'error_password_long': 'Le mot de passe ne doit pas dépasser 72 octets',
             'error_user_exists': 'Cet email est déjà utilisé',
             'error_login_failed': 'Email ou mot de passe incorrect',
             'success_account_created': '✅ Compte créé avec succès ! Vous pouvez maintenant vous connecter.',
@@ -161,6 +264,7 @@ def check_login() -> bool:
             'error_invalid_email': 'Invalid email',
             'error_password_mismatch': 'Passwords do not match',
             'error_password_short': 'Password must be at least 6 characters',
+            'error_password_long': 'Password must not exceed 72 bytes',
             'error_user_exists': 'This email is already in use',
             'error_login_failed': 'Invalid email or password',
             'success_account_created': '✅ Account created successfully! You can now sign in.',
@@ -185,7 +289,10 @@ def check_login() -> bool:
         # Récupérer l'utilisateur depuis toutes les sources
         user = get_user_from_all_sources(email)
         
-        if user and hash_password(password) == user.get("password_hash"):
+        password_hash = user.get("password_hash") if user else None
+        
+        # verify_password toujours appelé (hash factice si email inconnu) : pas d'énumération
+        if verify_password(password, password_hash) and user:
             # Authentification réussie
             st.session_state["authenticated"] = True
             st.session_state["user_email"] = email
@@ -221,6 +328,10 @@ def check_login() -> bool:
             st.session_state["register_error"] = t['error_password_short']
             return
         
+        if password_too_long(password):
+            st.session_state["register_error"] = t['error_password_long']
+            return
+        
         if user_exists(email):
             st.session_state["register_error"] = t['error_user_exists']
             return
@@ -267,46 +378,15 @@ def check_login() -> bool:
     t = texts.get(st.session_state.get("ui_lang", "fr"), texts['fr'])
     
     
-    # Styles CSS
-    st.markdown("""
-    <style>
-        .login-container {
-            max-width: 500px;
-            margin: 0 auto;
-            padding: 2rem;
-        }
-        .login-header {
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-        .trial-badge {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 1rem;
-            border-radius: 10px;
-            text-align: center;
-            margin-bottom: 2rem;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    st.markdown('<div class="login-container">', unsafe_allow_html=True)
-    
-    # Header
-    st.markdown('<div class="login-header">', unsafe_allow_html=True)
-    st.title(t['title'])
-    st.markdown(f"**{t['app_name']}**")
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Badge essai gratuit
-    st.markdown(f"""
-    <div class="trial-badge">
-        <h3 style="margin: 0; color: white;">{t['trial_badge_title']}</h3>
-        <p style="margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-            <strong>{t['trial_badge_text']}</strong>
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    # Styles CSS + header + badge en un seul rendu (à réémettre à chaque
+    # rerun : Streamlit retire les éléments qui ne sont pas redessinés)
+    header_html = _LOGIN_HEADER_HTML.format(
+        title=t['title'],
+        app_name=t['app_name'],
+        badge_title=t['trial_badge_title'],
+        badge_text=t['trial_badge_text'],
+    )
+    st.markdown(_LOGIN_CSS + header_html, unsafe_allow_html=True)
     
     # Toggle entre Login et Register
     show_register = st.session_state.get("show_register", False)
@@ -426,8 +506,6 @@ def check_login() -> bool:
         - 🏢 {t['enterprise_plan']}
         """)
     
-    st.markdown('</div>', unsafe_allow_html=True)
-    
     return False
 
 
@@ -435,19 +513,39 @@ def check_login() -> bool:
 # GESTION DES QUOTAS
 # ==========================================
 
-def can_generate_report() -> Tuple[bool, str]:
+@dataclass
+class QuotaView:
+    """Lecture unique des clés de quota de la session"""
+    # __slots__ explicites (dataclass(slots=True) exige Python 3.10)
+    __slots__ = ("plan", "used", "limit")
+    plan: str
+    used: int
+    limit: int
+    
+    @classmethod
+    def load(cls, ss: Mapping[str, Any]) -> "QuotaView":
+        return cls(
+            ss.get("user_plan", "trial"),
+            ss.get("reports_used", 0),
+            ss.get("reports_limit", 3),
+        )
+
+
+def can_generate_report(view: Optional[QuotaView] = None) -> Tuple[bool, str]:
     """
     Vérifie si l'utilisateur peut générer un rapport
     
+    Args:
+        view: Quota déjà lu (sinon relu depuis la session)
+    
     Returns:
         (bool, str): (peut_générer, message)
     """
     if not st.session_state.get("authenticated"):
         return False, "Not authenticated"
     
-    plan = st.session_state.get("user_plan", "trial")
-    used = st.session_state.get("reports_used", 0)
-    limit = st.session_state.get("reports_limit", 3)
+    view = view or QuotaView.load(st.session_state)
+    plan, used, limit = view.plan, view.used, view.limit
     
     ui_lang = st.session_state.get("ui_lang", "fr")
     
@@ -480,26 +578,47 @@ def can_generate_report() -> Tuple[bool, str]:
 
 
 def increment_report_count():
-    """Incrémente le compteur de rapports utilisés"""
+    """
+    Incrémente le compteur de rapports utilisés
+    Appelée à la fin de chaque génération : le compteur est écrit aussitôt dans la base
+    utilisateurs (voir flush_report_count), un onglet fermé sans logout ne perd rien
+    """
     if "reports_used" in st.session_state:
         st.session_state.reports_used += 1
-        
-        # Si l'utilisateur est dans registered_users, mettre à jour
-        email = st.session_state.get("user_email")
-        if email and "registered_users" in st.session_state:
-            if email in st.session_state.registered_users:
-                st.session_state.registered_users[email]["reports_used"] = st.session_state.reports_used
-
-
-def get_quota_info() -> Dict:
-    """Retourne les informations de quota de l'utilisateur"""
-    plan = st.session_state.get("user_plan", "trial")
-    used = st.session_state.get("reports_used", 0)
-    limit = st.session_state.get("reports_limit", 3)
+        st.session_state.pop("_quota_key", None)
+        st.session_state["_pending_increments"] = st.session_state.get("_pending_increments", 0) + 1
+        flush_report_count()
+
+
+def flush_report_count():
+    """
+    Écrit le compteur en attente dans la base utilisateurs (sans effet si rien n'est en attente)
+    EN PRODUCTION: l'appel Supabase/Firebase se fait ici
+    """
+    if not st.session_state.pop("_pending_increments", 0):
+        return
+    
+    # Si l'utilisateur est dans registered_users, mettre à jour
+    email = st.session_state.get("user_email")
+    if email and "registered_users" in st.session_state:
+        if email in st.session_state.registered_users:
+            st.session_state.registered_users[email]["reports_used"] = st.session_state.reports_used
+
+
+def get_quota_info(view: Optional[QuotaView] = None) -> Dict:
+    """
+    Retourne les informations de quota de l'utilisateur
+    Mis en cache dans la session tant que (utilisés, limite, plan) ne changent pas
+    """
+    view = view or QuotaView.load(st.session_state)
+    used, limit, plan = key = (view.used, view.limit, view.plan)
+    if st.session_state.get("_quota_key") == key:
+        return st.session_state["_quota_cache"]
+    
     remaining = max(0, limit - used)
     percentage = (used / limit * 100) if limit > 0 else 0
     
-    return {
+    quota = {
         "plan": plan,
         "used": used,
         "limit": limit,
@@ -508,58 +627,75 @@ def get_quota_info() -> Dict:
         "is_trial": plan == "trial",
         "is_expired": used >= limit
     }
+    st.session_state["_quota_key"] = key
+    st.session_state["_quota_cache"] = quota
+    return quota
 
 
 # ==========================================
 # UI HELPER
 # ==========================================
 
+# Traductions du quota (construites une fois à l'import)
+_QUOTA_TEXTS = {
+    'fr': {
+        'trial_label': "🎁 Essai Gratuit",
+        'trial_expired': "🚫 Essai gratuit épuisé",
+        'used_label': "Utilisés",
+        'remaining_label': "Restants",
+        'trial_ended': "⚠️ Essai gratuit terminé",
+        'continue_text': "Continuez à utiliser le service :",
+        'contact_text': "📧 Contact : agouanetf@yahoo.com",
+        'pricing_title': "Tarifs :",
+        'starter': "🌱 29$/mois (100 rapports)",
+        'pro': "🚀 99$/mois (500 rapports)",
+        'warning_remaining_tmpl': "⚠️ Plus que {remaining} rapport(s) gratuit(s) !",
+        'warning_monthly_tmpl': "⚠️ Plus que {remaining} rapport(s) ce mois",
+        'think_subscribe': "💡 Pensez à vous abonner pour continuer",
+        'limit_reached': "Limite atteinte",
+    },
+    'en': {
+        'trial_label': "🎁 Free Trial",
+        'trial_expired': "🚫 Free trial expired",
+        'used_label': "Used",
+        'remaining_label': "Remaining",
+        'trial_ended': "⚠️ Free trial ended",
+        'continue_text': "Continue using the service:",
+        'contact_text': "📧 Contact: agouanetf@yahoo.com",
+        'pricing_title': "Pricing:",
+        'starter': "🌱 29$/month (100 reports)",
+        'pro': "🚀 99$/month (500 reports)",
+        'warning_remaining_tmpl': "⚠️ Only {remaining} free report(s) left!",
+        'warning_monthly_tmpl': "⚠️ Only {remaining} report(s) left this month",
+        'think_subscribe': "💡 Consider subscribing to continue",
+        'limit_reached': "Limit reached",
+    }
+}
+
+
+# st.fragment (Streamlit >= 1.37) : le bloc quota est rendu comme un sous-arbre
+# isolé ; sans support, le décorateur est neutre
+_fragment = getattr(st, "fragment", lambda func: func)
+
+
+@_fragment
 def show_quota_sidebar():
-    """Affiche le quota dans la sidebar"""
+    """Affiche le quota dans la sidebar (fragment Streamlit si disponible)"""
     if not st.session_state.get("authenticated"):
         return
     
     ui_lang = st.session_state.get("ui_lang", "fr")
     quota = get_quota_info()
+    t = _QUOTA_TEXTS['fr' if ui_lang == 'fr' else 'en']
     
     st.markdown("---")
     
-    # Traductions
-    if ui_lang == 'fr':
-        trial_label = "🎁 Essai Gratuit"
-        trial_expired = "🚫 Essai gratuit épuisé"
-        used_label = "Utilisés"
-        remaining_label = "Restants"
-        trial_ended = "⚠️ Essai gratuit terminé"
-        continue_text = "Continuez à utiliser le service :"
-        contact_text = "📧 Contact : agouanetf@yahoo.com"
-        pricing_title = "Tarifs :"
-        starter = "🌱 29$/mois (100 rapports)"
-        pro = "🚀 99$/mois (500 rapports)"
-        warning_remaining = f"⚠️ Plus que {quota['remaining']} rapport(s) gratuit(s) !"
-        warning_monthly = f"⚠️ Plus que {quota['remaining']} rapport(s) ce mois"
-        think_subscribe = "💡 Pensez à vous abonner pour continuer"
-    else:
-        trial_label = "🎁 Free Trial"
-        trial_expired = "🚫 Free trial expired"
-        used_label = "Used"
-        remaining_label = "Remaining"
-        trial_ended = "⚠️ Free trial ended"
-        continue_text = "Continue using the service:"
-        contact_text = "📧 Contact: agouanetf@yahoo.com"
-        pricing_title = "Pricing:"
-        starter = "🌱 29$/month (100 reports)"
-        pro = "🚀 99$/month (500 reports)"
-        warning_remaining = f"⚠️ Only {quota['remaining']} free report(s) left!"
-        warning_monthly = f"⚠️ Only {quota['remaining']} report(s) left this month"
-        think_subscribe = "💡 Consider subscribing to continue"
-    
     if quota["is_trial"]:
         # Badge essai gratuit
         if quota["is_expired"]:
-            st.error(trial_expired)
+            st.error(t['trial_expired'])
         else:
-            st.info(trial_label)
+            st.info(t['trial_label'])
     else:
         plan_labels = {
             "starter": "🌱 Starter",
@@ -572,134 +708,144 @@ def show_quota_sidebar():
     if quota["limit"] > 0:
         st.progress(min(quota["percentage"] / 100, 1.0))
     
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric(used_label, quota["used"])
-    with col2:
-        st.metric(remaining_label, quota["remaining"])
+    # Un seul widget : utilisés / limite, restants dans le libellé (pas de delta signé ni de flèche)
+    st.metric(
+        f"{t['used_label']} · {quota['remaining']} {t['remaining_label'].lower()}",
+        f"{quota['used']} / {quota['limit']}",
+    )
     
     # Avertissements
     if quota["is_trial"] and quota["is_expired"]:
-        st.error(f"**{trial_ended}**")
+        st.error(f"**{t['trial_ended']}**")
         st.markdown(f"""
-        **{continue_text}**
+        **{t['continue_text']}**
         
-        {contact_text}
+        {t['contact_text']}
         
-        **{pricing_title}**
-        - {starter}
-        - {pro}
+        **{t['pricing_title']}**
+        - {t['starter']}
+        - {t['pro']}
         """)
     
     elif quota["is_trial"] and quota["remaining"] <= 1:
-        st.warning(warning_remaining)
-        st.info(think_subscribe)
+        st.warning(t['warning_remaining_tmpl'].format(remaining=quota['remaining']))
+        st.info(t['think_subscribe'])
     
     elif not quota["is_trial"] and quota["remaining"] <= 5:
-        st.warning(warning_monthly)
+        st.warning(t['warning_monthly_tmpl'].format(remaining=quota['remaining']))
+
+
+# Messages d'upgrade (constantes : pas de reconstruction à chaque appel)
+_UPGRADE_MD_FR = """
+### 🎉 Vous avez utilisé vos 3 rapports gratuits !
+
+**Le service vous plaît ?** Passez à un plan payant pour continuer :
+
+#### 📋 Nos Offres
+
+**🌱 Starter - 29$/mois**
+- ✅ 100 rapports/mois
+- ✅ Export HTML + Word
+- ✅ Support email
+
+**🚀 Pro - 99$/mois** ⭐ Populaire
+- ✅ 500 rapports/mois
+- ✅ Export HTML + Word
+- ✅ Support prioritaire
+- ✅ API access
+
+**🏢 Enterprise - Sur devis**
+- ✅ Rapports illimités
+- ✅ Support dédié
+- ✅ Personnalisation
+
+---
+
+📧 **Contact** : agouanetf@yahoo.com  
+💬 **Sujet** : Abonnement AI Report Generator
+"""
+
+_UPGRADE_MD_EN = """
+### 🎉 You've used your 3 free reports!
+
+**Enjoyed the service?** Upgrade to a paid plan to continue:
+
+#### 📋 Our Plans
+
+**🌱 Starter - $29/month**
+- ✅ 100 reports/month
+- ✅ HTML + Word export
+- ✅ Email support
+
+**🚀 Pro - $99/month** ⭐ Popular
+- ✅ 500 reports/month
+- ✅ HTML + Word export
+- ✅ Priority support
+- ✅ API access
+
+**🏢 Enterprise - Custom pricing**
+- ✅ Unlimited reports
+- ✅ Dedicated support
+- ✅ Customization
+
+---
+
+📧 **Contact**: agouanetf@yahoo.com  
+💬 **Subject**: AI Report Generator Subscription
+"""
+
+_LIMIT_MD_FR = """
+### ⚠️ Limite mensuelle atteinte
+
+Vous avez utilisé vos **{limit} rapports** de ce mois.
+
+**Options :**
+- ⏳ Attendez le mois prochain
+- 📈 Passez au plan supérieur
+
+📧 **Contact** : agouanetf@yahoo.com
+"""
+
+_LIMIT_MD_EN = """
+### ⚠️ Monthly limit reached
+
+You've used your **{limit} reports** for this month.
+
+**Options:**
+- ⏳ Wait for next month
+- 📈 Upgrade to higher plan
+
+📧 **Contact**: agouanetf@yahoo.com
+"""
 
 
 def show_upgrade_message():
     """Affiche le message pour passer à un plan payant"""
     ui_lang = st.session_state.get("ui_lang", "fr")
     quota = get_quota_info()
+    t = _QUOTA_TEXTS['fr' if ui_lang == 'fr' else 'en']
     
-    st.error("🚫 **" + ("Limite atteinte" if ui_lang == 'fr' else "Limit reached") + "**")
+    st.error(f"🚫 **{t['limit_reached']}**")
     
     if quota["is_trial"]:
-        if ui_lang == 'fr':
-            st.markdown("""
-            ### 🎉 Vous avez utilisé vos 3 rapports gratuits !
-            
-            **Le service vous plaît ?** Passez à un plan payant pour continuer :
-            
-            #### 📋 Nos Offres
-            
-            **🌱 Starter - 29$/mois**
-            - ✅ 100 rapports/mois
-            - ✅ Export HTML + Word
-            - ✅ Support email
-            
-            **🚀 Pro - 99$/mois** ⭐ Populaire
-            - ✅ 500 rapports/mois
-            - ✅ Export HTML + Word
-            - ✅ Support prioritaire
-            - ✅ API access
-            
-            **🏢 Enterprise - Sur devis**
-            - ✅ Rapports illimités
-            - ✅ Support dédié
-            - ✅ Personnalisation
-            
-            ---
-            
-            📧 **Contact** : agouanetf@yahoo.com  
-            💬 **Sujet** : Abonnement AI Report Generator
-            """)
-        else:
-            st.markdown("""
-            ### 🎉 You've used your 3 free reports!
-            
-            **Enjoyed the service?** Upgrade to a paid plan to continue:
-            
-            #### 📋 Our Plans
-            
-            **🌱 Starter - $29/month**
-            - ✅ 100 reports/month
-            - ✅ HTML + Word export
-            - ✅ Email support
-            
-            **🚀 Pro - $99/month** ⭐ Popular
-            - ✅ 500 reports/month
-            - ✅ HTML + Word export
-            - ✅ Priority support
-            - ✅ API access
-            
-            **🏢 Enterprise - Custom pricing**
-            - ✅ Unlimited reports
-            - ✅ Dedicated support
-            - ✅ Customization
-            
-            ---
-
-            📧 **Contact**: agouanetf@yahoo.com  
-            💬 **Subject**: AI Report Generator Subscription
-            """)
+        st.markdown(_UPGRADE_MD_FR if ui_lang == 'fr' else _UPGRADE_MD_EN)
     else:
-        if ui_lang == 'fr':
-            st.markdown(f"""
-            ### ⚠️ Limite mensuelle atteinte
-            
-            Vous avez utilisé vos **{quota['limit']} rapports** de ce mois.
-            
-            **Options :**
-            - ⏳ Attendez le mois prochain
-            - 📈 Passez au plan supérieur
-            
-            📧 **Contact** : agouanetf@yahoo.com
-            """)
-        else:
-            st.markdown(f"""
-            ### ⚠️ Monthly limit reached
-            
-            You've used your **{quota['limit']} reports** for this month.
-            
-            **Options:**
-            - ⏳ Wait for next month
-            - 📈 Upgrade to higher plan
-            
-            📧 **Contact**: agouanetf@yahoo.com
-            """)
+        template = _LIMIT_MD_FR if ui_lang == 'fr' else _LIMIT_MD_EN
+        st.markdown(template.format(limit=quota['limit']))
+
+
+# Clés conservées à la déconnexion (tout le reste est effacé)
+# registered_users sert de base utilisateurs MVP : la vider supprimerait les comptes
+_LOGOUT_PRESERVED_KEYS = {"ui_lang", "registered_users"}
 
 
 def logout():
-    """Déconnexion"""
-    keys_to_delete = [
-        "authenticated", "user_email", "user_plan", 
-        "reports_used", "reports_limit", "auth_error",
-        "register_error", "register_success", "show_register"
-    ]
-    for key in keys_to_delete:
-        if key in st.session_state:
-            del st.session_state[key]
+    """Déconnexion : vide la session sauf la liste blanche"""
+    flush_report_count()
+    saved = {
+        key: st.session_state[key]
+        for key in _LOGOUT_PRESERVED_KEYS if key in st.session_state
+    }
+    st.session_state.clear()
+    st.session_state.update(saved)
     st.rerun()
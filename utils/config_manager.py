@@ -3,16 +3,38 @@ Gestionnaire de configuration persistante
 Sauvegarde les paramètres utilisateur (clé API, modèle préféré, etc.)
 """
 
+import copy
 import os
 import pickle
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any
+import orjson
 import streamlit as st
 
+__all__ = [
+    'CONFIG_DIR',
+    'CONFIG_FILE',
+    'load_config',
+    'save_config',
+    'get_api_key',
+    'save_api_key',
+    'delete_api_key',
+    'get_ollama_model',
+    'save_ollama_model',
+    'get_user_preferences',
+    'save_user_preference',
+    'clear_all_config',
+]
+
 
 # Chemin du fichier de configuration
 CONFIG_DIR = Path.home() / ".streamlit"
-CONFIG_FILE = CONFIG_DIR / "ai_report_generator_config.pkl"
+CONFIG_FILE = CONFIG_DIR / "ai_report_generator_config.json"
+
+# Ancien format (pickle), migré automatiquement en JSON au premier chargement
+LEGACY_CONFIG_FILE = CONFIG_DIR / "ai_report_generator_config.pkl"
 
 
 def ensure_config_dir():
@@ -32,15 +54,40 @@ def load_config() -> Dict[str, Any]:
     """
     try:
         if CONFIG_FILE.exists():
-            with open(CONFIG_FILE, 'rb') as f:
-                config = pickle.load(f)
-                return config if isinstance(config, dict) else {}
+            # Copie : les appelants modifient le dict avant save_config()
+            return copy.deepcopy(_load_config_cached(CONFIG_FILE.stat().st_mtime_ns))
+        
+        if LEGACY_CONFIG_FILE.exists():
+            return _migrate_legacy_config()
     except Exception as e:
         print(f"Error loading config: {e}")
     
     return {}
 
 
+@lru_cache(maxsize=1)
+def _load_config_cached(mtime_ns: int) -> Dict[str, Any]:
+    """Lit et décode le fichier une seule fois par date de modification"""
+    config = orjson.loads(CONFIG_FILE.read_bytes())
+    return config if isinstance(config, dict) else {}
+
+
+def _migrate_legacy_config() -> Dict[str, Any]:
+    """Convertit l'ancien fichier pickle en JSON (une seule fois)"""
+    raw = LEGACY_CONFIG_FILE.read_bytes()
+    if not raw.startswith(b'\x80'):  # Pas un pickle : ignorer
+        return {}
+    
+    config = pickle.loads(raw)
+    config = config if isinstance(config, dict) else {}
+    
+    save_config(config)
+    if CONFIG_FILE.exists():
+        LEGACY_CONFIG_FILE.unlink()
+    
+    return config
+
+
 def save_config(config: Dict[str, Any]):
     """
     Sauvegarde la configuration
@@ -50,18 +97,30 @@ def save_config(config: Dict[str, Any]):
     """
     try:
         ensure_config_dir()
-        with open(CONFIG_FILE, 'wb') as f:
-            pickle.dump(config, f)
+        # Écriture atomique : fichier temporaire puis renommage
+        fd, tmp_path = tempfile.mkstemp(dir=CONFIG_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(orjson.dumps(config))
+            os.replace(tmp_path, CONFIG_FILE)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
     except Exception as e:
         print(f"Error saving config: {e}")
+    finally:
+        _load_config_cached.cache_clear()
+        get_api_key.clear()
 
 
+@st.cache_resource(show_spinner=False)
 def get_api_key() -> Optional[str]:
     """
     Récupère la clé API sauvegardée
     
     Essaie d'abord st.secrets (production Streamlit Cloud),
     puis le fichier local (développement)
+    Résultat mis en cache pour le processus (invalidé à chaque écriture)
     
     Returns:
         str: Clé API ou None
@@ -135,20 +194,11 @@ def save_user_preference(key: str, value: Any):
 def clear_all_config():
     """Supprime toute la configuration"""
     try:
-        if CONFIG_FILE.exists():
-            CONFIG_FILE.unlink()
+        for path in (CONFIG_FILE, LEGACY_CONFIG_FILE):
+            if path.exists():
+                path.unlink()
     except Exception as e:
         print(f"Error clearing config: {e}")
-
-# Dans config_manager.py, ajouter :
-def get_api_key() -> Optional[str]:
-    # D'abord essayer st.secrets (production)
-    try:
-        if 'anthropic_api_key' in st.secrets:
-            return st.secrets['anthropic_api_key']
-    except:
-        pass
-    
-    # Sinon essayer le fichier local (dev)
-    config = load_config()
-    return config.get('anthropic_api_key')
\ No newline at end of file
+    finally:
+        _load_config_cached.cache_clear()
+        get_api_key.clear()
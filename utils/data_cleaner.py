@@ -3,15 +3,71 @@ Module de nettoyage et prétraitement des données
 SEUIL QUASI-VIDE : ≥90% 
 """
 
+import uuid
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict, Any, List
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Tuple, Dict, Any, List, Optional
+
+# Copy-on-Write : toujours actif avec pandas >= 3.0, à activer explicitement en 2.x
+# (les copies superficielles ne dupliquent alors que les colonnes modifiées)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+
+# Traductions (construites une fois à l'import)
+_MESSAGES = {
+    'fr': {
+        'empty_detected': "🔍 {} colonne(s) complètement vide(s) détectée(s): {}",
+        'quasi_empty': "⚠️ {} colonne(s) quasi-vides (≥90%): {}",
+        'duplicates': "🔄 {} ligne(s) dupliquée(s) détectée(s)",
+        'missing_top': "📊 Colonnes avec le plus de valeurs manquantes: {}",
+        'converted': "🔢 {} colonne(s) convertie(s) en numérique: {}",
+        'high_missing': "⚠️ {} colonne(s) avec >50% de valeurs manquantes: {}",
+    },
+    'en': {
+        'empty_detected': "🔍 {} completely empty column(s) detected: {}",
+        'quasi_empty': "⚠️ {} quasi-empty column(s) (≥90%): {}",
+        'duplicates': "🔄 {} duplicate row(s) detected",
+        'missing_top': "📊 Columns with most missing values: {}",
+        'converted': "🔢 {} column(s) converted to numeric: {}",
+        'high_missing': "⚠️ {} column(s) with >50% missing values: {}",
+    }
+}
+
+
+def _format_cols(cols, lim: int = 5, fmt=str) -> str:
+    """Liste courte des colonnes pour les messages : 'a, b, c... (+N)'"""
+    display = ', '.join(map(fmt, islice(cols, lim)))
+    overflow = f'... (+{len(cols) - lim})' if len(cols) > lim else ''
+    return f'{display}{overflow}'
+
+
+def _fingerprint(df: pd.DataFrame) -> Optional[str]:
+    """
+    Empreinte xxh3 du contenu, des noms et des types de colonnes
+    None si le contenu n'est pas hachable (listes, dicts dans les cellules...)
+    """
+    import xxhash
+    
+    try:
+        h = xxhash.xxh3_128()
+        h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+        # Noms et types à part : hash_pandas_object ne les couvre pas
+        h.update(repr(list(df.columns)).encode())
+        h.update(str(df.dtypes.values).encode())
+        return h.hexdigest()
+    except TypeError:
+        return None
 
 
 def clean_and_preprocess(df: pd.DataFrame, lang: str = 'fr') -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Analyse les données et signale les problèmes SANS supprimer
     ✅ SEUIL QUASI-VIDE : ≥90% 
+    Résultat mis en cache par empreinte du contenu (reruns, changement de langue)
     
     Args:
         df: DataFrame pandas original
@@ -20,6 +76,28 @@ def clean_and_preprocess(df: pd.DataFrame, lang: str = 'fr') -> Tuple[pd.DataFra
     Returns:
         tuple: (df_cleaned, cleaning_report)
     """
+    return _clean_cached(df, lang)
+
+
+def _hash_frame(df: pd.DataFrame) -> str:
+    """Clé de cache : empreinte du contenu, ou clé unique (jamais partagée) si non hachable"""
+    return _fingerprint(df) or uuid.uuid4().hex
+
+
+# Cache borné (ttl + max_entries), thread-safe et partagé entre sessions par st.cache_data ;
+# chaque appel reçoit sa propre copie du résultat
+@st.cache_data(
+    ttl=3600,
+    max_entries=4,
+    show_spinner=False,
+    hash_funcs={pd.DataFrame: _hash_frame},
+)
+def _clean_cached(df: pd.DataFrame, lang: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    return _clean_and_preprocess(df, lang)
+
+
+def _clean_and_preprocess(df: pd.DataFrame, lang: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Nettoyage effectif (voir clean_and_preprocess)"""
     
     # Initialiser le rapport
     cleaning_report = {
@@ -39,42 +117,38 @@ def clean_and_preprocess(df: pd.DataFrame, lang: str = 'fr') -> Tuple[pd.DataFra
         'dropped_empty_columns': [],
         'dropped_duplicate_rows': 0,
         'converted_to_numeric': [],
+        'converted_to_category': [],
         'missing_values_after': {}
     }
     
-    df_cleaned = df.copy()
-    
-    # Traductions
-    messages = {
-        'fr': {
-            'empty_detected': "🔍 {} colonne(s) complètement vide(s) détectée(s): {}",
-            'quasi_empty': "⚠️ {} colonne(s) quasi-vides (≥90%): {}",
-            'duplicates': "🔄 {} ligne(s) dupliquée(s) détectée(s)",
-            'missing_top': "📊 Colonnes avec le plus de valeurs manquantes: {}",
-            'converted': "🔢 {} colonne(s) convertie(s) en numérique: {}",
-            'high_missing': "⚠️ {} colonne(s) avec >50% de valeurs manquantes: {}",
-        },
-        'en': {
-            'empty_detected': "🔍 {} completely empty column(s) detected: {}",
-            'quasi_empty': "⚠️ {} quasi-empty column(s) (≥90%): {}",
-            'duplicates': "🔄 {} duplicate row(s) detected",
-            'missing_top': "📊 Columns with most missing values: {}",
-            'converted': "🔢 {} column(s) converted to numeric: {}",
-            'high_missing': "⚠️ {} column(s) with >50% missing values: {}",
-        }
-    }
+    # Copie superficielle : les colonnes modifiées sont recopiées à la demande (CoW)
+    df_cleaned = df.copy(deep=False)
     
-    msg = messages.get(lang, messages['fr'])
+    msg = _MESSAGES.get(lang, _MESSAGES['fr'])
     
     # ==========================================
     # 1. NETTOYER LES NOMS DE COLONNES (OK)
     # ==========================================
     df_cleaned.columns = df_cleaned.columns.str.strip()
     
+    n = len(df_cleaned)
+    
+    # Le hachage des lignes (étape 5) tourne dans un thread pendant les étapes 2 à 4
+    # (pandas/numpy relâchent le GIL dans leurs boucles C)
+    dup_future = None
+    if n >= 2:
+        executor = ThreadPoolExecutor(max_workers=1)
+        dup_future = executor.submit(df_cleaned.duplicated, keep='first')
+        executor.shutdown(wait=False)
+    
+    # Un seul passage isna() pour les étapes 2 à 4 et 7
+    na_mask = df_cleaned.isna()
+    na_counts = na_mask.sum(axis=0)
+    
     # ==========================================
     # 2. DÉTECTER LES COLONNES COMPLÈTEMENT VIDES
     # ==========================================
-    empty_cols = df_cleaned.columns[df_cleaned.isnull().all()].tolist()
+    empty_cols = na_counts.index[na_counts.values == n].tolist()
     
     if empty_cols:
         cleaning_report['empty_cols'] = empty_cols
@@ -85,19 +159,15 @@ def clean_and_preprocess(df: pd.DataFrame, lang: str = 'fr') -> Tuple[pd.DataFra
             'count': len(empty_cols)
         })
         
-        cols_display = ', '.join(map(str, empty_cols[:5]))
-        if len(empty_cols) > 5:
-            cols_display += f'... (+{len(empty_cols)-5})'
-        
         cleaning_report['warnings'].append(
-            msg['empty_detected'].format(len(empty_cols), cols_display)
+            msg['empty_detected'].format(len(empty_cols), _format_cols(empty_cols))
         )
     
     # ==========================================
     # 3. DÉTECTER LES COLONNES QUASI-VIDES (≥90%)
     # ==========================================
-    missing_pct = (df_cleaned.isnull().sum() / len(df_cleaned) * 100)
-    quasi_empty = missing_pct[missing_pct >= 90].index.tolist()
+    missing_pct = na_counts / n * 100
+    quasi_empty = missing_pct.index[missing_pct.values >= 90].tolist()
     
     if quasi_empty:
         cleaning_report['quasi_empty_cols'] = quasi_empty
@@ -108,31 +178,31 @@ def clean_and_preprocess(df: pd.DataFrame, lang: str = 'fr') -> Tuple[pd.DataFra
             'count': len(quasi_empty)
         })
         
-        cols_display = ', '.join(map(str, quasi_empty[:5]))
-        if len(quasi_empty) > 5:
-            cols_display += f'... (+{len(quasi_empty)-5})'
-        
         cleaning_report['warnings'].append(
-            msg['quasi_empty'].format(len(quasi_empty), cols_display)
+            msg['quasi_empty'].format(len(quasi_empty), _format_cols(quasi_empty))
         )
     
     # ==========================================
     # 4. DÉTECTER LES LIGNES COMPLÈTEMENT VIDES
     # ==========================================
-    empty_rows = df_cleaned.isnull().all(axis=1).sum()
+    empty_rows = na_mask.values.all(axis=1).sum()
+    del na_mask
     
     if empty_rows > 0:
         cleaning_report['anomalies_detected'].append({
             'type': 'empty_rows',
             'severity': 'info',
             'count': int(empty_rows),
-            'percentage': float((empty_rows / len(df_cleaned)) * 100)
+            'percentage': float((empty_rows / n) * 100)
         })
     
     # ==========================================
     # 5. DÉTECTER LES DOUBLONS
     # ==========================================
-    duplicates = df_cleaned.duplicated().sum()
+    if dup_future is not None:
+        duplicates = int(dup_future.result().sum())
+    else:
+        duplicates = 0
     
     if duplicates > 0:
         cleaning_report['duplicate_rows'] = duplicates
@@ -151,51 +221,56 @@ def clean_and_preprocess(df: pd.DataFrame, lang: str = 'fr') -> Tuple[pd.DataFra
     # 6. CONVERTIR LES COLONNES NUMÉRIQUES (OK)
     # ==========================================
     converted_cols = []
+    obj_df = df_cleaned.select_dtypes(include=['object'])
     
-    for col in df_cleaned.select_dtypes(include=['object']).columns:
-        try:
-            converted = pd.to_numeric(df_cleaned[col], errors='coerce')
+    if len(obj_df.columns) > 0:
+        # Conversion de toutes les colonnes texte en un passage, puis réaffectation groupée
+        coerced = obj_df.apply(pd.to_numeric, errors='coerce')
+        ratio = coerced.notna().sum(axis=0) / n
+        keep = ratio.index[ratio.values > 0.5]
+        
+        if len(keep) > 0:
+            df_cleaned[keep] = coerced[keep]
+            converted_cols = keep.tolist()
             
-            if converted.notna().sum() / len(df_cleaned) > 0.5:
-                df_cleaned[col] = converted
-                converted_cols.append(col)
-        except:
-            pass
+            # Réduire au plus petit type compatible (entier si complet et entier, sinon float32)
+            # errstate : pandas essaie int8/int16 d'abord, les débordements sont attendus
+            with np.errstate(invalid='ignore'):
+                for col in converted_cols:
+                    values = df_cleaned[col]
+                    if values.notna().all() and (values % 1 == 0).all():
+                        df_cleaned[col] = pd.to_numeric(values, downcast='integer')
+                    else:
+                        df_cleaned[col] = pd.to_numeric(values, downcast='float')
     
     if converted_cols:
         cleaning_report['converted_to_numeric'] = converted_cols
         
-        cols_display = ', '.join(map(str, converted_cols[:5]))
-        if len(converted_cols) > 5:
-            cols_display += f'... (+{len(converted_cols)-5})'
-        
         cleaning_report['recommendations'].append(
-            msg['converted'].format(len(converted_cols), cols_display)
+            msg['converted'].format(len(converted_cols), _format_cols(converted_cols))
         )
     
     # ==========================================
     # 7. ANALYSER LES VALEURS MANQUANTES
     # ==========================================
-    missing_info = {}
-    missing_info_after = {}
-    high_missing_cols = []
+    # La conversion numérique (étape 6) peut créer des NaN : recompter ces colonnes
+    if converted_cols:
+        na_counts[converted_cols] = df_cleaned[converted_cols].isna().sum(axis=0)
     
-    for col in df_cleaned.columns:
-        missing_count = df_cleaned[col].isnull().sum()
-        
-        if missing_count > 0:
-            missing_pct = (missing_count / len(df_cleaned)) * 100
-            
-            missing_info[col] = {
-                'count': int(missing_count),
-                'percentage': float(missing_pct)
-            }
-            
-            missing_info_after[col] = int(missing_count)
-            
-            # Identifier colonnes avec >50% manquant
-            if missing_pct > 50:
-                high_missing_cols.append((col, missing_pct))
+    missing = na_counts[na_counts.values > 0]
+    missing_pct = missing / n * 100
+    missing_pcts = missing_pct.values
+    
+    missing_info = {
+        col: {'count': int(count), 'percentage': float(pct)}
+        for col, count, pct in zip(missing.index, missing.values, missing_pcts)
+    }
+    missing_info_after = {col: info['count'] for col, info in missing_info.items()}
+    
+    # Identifier colonnes avec >50% manquant
+    high_missing_cols = [
+        (col, pct) for col, pct in zip(missing.index, missing_pcts) if pct > 50
+    ]
     
     cleaning_report['missing_values'] = missing_info
     cleaning_report['missing_values_after'] = missing_info_after
@@ -209,25 +284,20 @@ def clean_and_preprocess(df: pd.DataFrame, lang: str = 'fr') -> Tuple[pd.DataFra
             'count': len(high_missing_cols)
         })
         
-        cols_display = ', '.join([f"{col} ({pct:.1f}%)" for col, pct in high_missing_cols[:3]])
-        if len(high_missing_cols) > 3:
-            cols_display += f'... (+{len(high_missing_cols)-3})'
-        
+        cols_display = _format_cols(
+            high_missing_cols, lim=3, fmt=lambda item: f"{item[0]} ({item[1]:.1f}%)"
+        )
         cleaning_report['warnings'].append(
             msg['high_missing'].format(len(high_missing_cols), cols_display)
         )
     
     # Top 3 des colonnes avec valeurs manquantes
     if missing_info:
-        top_missing = sorted(
-            missing_info.items(), 
-            key=lambda x: x[1]['percentage'], 
-            reverse=True
-        )[:3]
+        top_missing = missing_pct.nlargest(3)
         
         missing_summary = ', '.join([
-            f"{col} ({info['percentage']:.1f}%)" 
-            for col, info in top_missing
+            f"{col} ({pct:.1f}%)" 
+            for col, pct in top_missing.items()
         ])
         
         cleaning_report['recommendations'].append(
@@ -237,14 +307,36 @@ def clean_and_preprocess(df: pd.DataFrame, lang: str = 'fr') -> Tuple[pd.DataFra
     # ==========================================
     # 8. NETTOYER LES ESPACES (OK)
     # ==========================================
-    for col in df_cleaned.select_dtypes(include=['object']).columns:
+    # Colonnes texte connues depuis l'étape 6 : pas de second select_dtypes,
+    # et les colonnes déjà converties en numérique ne sont pas reparcourues
+    converted_set = set(converted_cols)
+    for col in obj_df.columns:
+        if col in converted_set:
+            continue
         try:
             df_cleaned[col] = df_cleaned[col].str.strip()
         except:
             pass
     
     # ==========================================
-    # 9. FINALISER LE RAPPORT
+    # 9. CONVERTIR LES COLONNES TEXTE PEU VARIÉES EN CATÉGORIES
+    # ==========================================
+    # Après le strip : ' a' et 'a' donnent la même catégorie
+    category_cols = []
+    
+    for col in obj_df.columns:
+        if col in converted_set:
+            continue
+        s = df_cleaned[col]
+        nu = s.nunique(dropna=True)
+        if nu > 0 and nu / n < 0.5 and nu < 2**16:
+            df_cleaned[col] = s.astype('category')
+            category_cols.append(col)
+    
+    cleaning_report['converted_to_category'] = category_cols
+    
+    # ==========================================
+    # 10. FINALISER LE RAPPORT
     
     return df_cleaned, cleaning_report
 
@@ -274,10 +366,12 @@ def get_data_quality_score(cleaning_report: Dict[str, Any]) -> float:
     # Pénalités pour valeurs manquantes
     missing_values = cleaning_report.get('missing_values', {})
     if missing_values:
-        avg_missing = np.mean([
-            info['percentage'] 
-            for info in missing_values.values()
-        ])
+        pct = np.fromiter(
+            (info['percentage'] for info in missing_values.values()),
+            dtype=np.float64,
+            count=len(missing_values)
+        )
+        avg_missing = float(pct.mean())
         score -= min(avg_missing / 2, 25)
     
     return max(0.0, min(100.0, score))
@@ -291,17 +385,16 @@ def get_columns_to_exclude_from_viz(cleaning_report: Dict[str, Any]) -> List[str
         cleaning_report: Rapport de nettoyage
         
     Returns:
-        list: Colonnes à exclure (vides + quasi-vides ≥90%)
+        list: Colonnes à exclure (vides + quasi-vides ≥90%), triées
     """
-    exclude = []
-    
-    # Colonnes vides
-    exclude.extend(cleaning_report.get('empty_cols', []))
-    
-    # Colonnes quasi-vides (≥90%)
-    exclude.extend(cleaning_report.get('quasi_empty_cols', []))
+    # Colonnes vides + quasi-vides (≥90%), dédoublonnées en un seul set
+    exclude = {
+        *cleaning_report.get('empty_cols', ()),
+        *cleaning_report.get('quasi_empty_cols', ()),
+    }
     
-    return list(set(exclude))
+    # key=str : les noms de colonnes peuvent mélanger int et str
+    return sorted(exclude, key=str)
 
 
 def get_detailed_anomaly_report(cleaning_report: Dict[str, Any], lang: str = 'fr') -> Dict[str, Any]:
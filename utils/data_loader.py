@@ -1,16 +1,37 @@
 """
 Module de chargement des fichiers de données
-Supporte: CSV, Excel, JSON, Parquet
+Supporte: CSV, Excel, JSON, Parquet (CSV et Parquet lus via pyarrow)
 """
 
 import pandas as pd
 import streamlit as st
+from streamlit.runtime.uploaded_file_manager import UploadedFile
 from typing import Optional
 
 
+def _hash_upload(uploaded_file) -> bytes:
+    """
+    Empreinte du fichier uploadé (xxh3_128) : contenu + nom.
+    Le contenu distingue deux fichiers de même nom ; le nom (extension) distingue
+    deux fichiers identiques lus par des parseurs différents.
+    """
+    import xxhash
+    h = xxhash.xxh3_128(uploaded_file.getvalue())
+    h.update(uploaded_file.name.encode())
+    return h.digest()
+
+
+# Cache borné (ttl + max_entries) : un DataFrame par fichier (contenu + nom)
+@st.cache_data(
+    ttl=3600,
+    max_entries=16,
+    show_spinner=False,
+    hash_funcs={UploadedFile: _hash_upload},
+)
 def load_file(uploaded_file) -> Optional[pd.DataFrame]:
     """
     Charge différents types de fichiers
+    Mis en cache par empreinte du fichier : pas de re-parsing entre les reruns
     
     Args:
         uploaded_file: Fichier uploadé via Streamlit
@@ -33,7 +54,7 @@ def load_file(uploaded_file) -> Optional[pd.DataFrame]:
         
         # CSV
         if file_extension == 'csv':
-            df = pd.read_csv(uploaded_file)
+            df = _read_csv_arrow(uploaded_file)
             
         # Excel
         elif file_extension in ['xlsx', 'xls']:
@@ -45,7 +66,8 @@ def load_file(uploaded_file) -> Optional[pd.DataFrame]:
             
         # Parquet
         elif file_extension == 'parquet':
-            df = pd.read_parquet(uploaded_file)
+            import pyarrow.parquet as pq
+            df = pq.read_table(uploaded_file, use_threads=True).to_pandas()
             
         else:
             st.error(f"❌ Format non supporté: {file_extension}")
@@ -75,6 +97,63 @@ def load_file(uploaded_file) -> Optional[pd.DataFrame]:
         return None
 
 
+def _read_csv_arrow(uploaded_file) -> pd.DataFrame:
+    """
+    Lit un CSV avec le lecteur multi-thread de pyarrow, avec la sémantique de pd.read_csv :
+    mêmes jetons NA (aussi pour les colonnes texte), pas de conversion automatique des dates,
+    colonnes entièrement vides en float64.
+    Repli sur pd.read_csv si pyarrow échoue (séparateur exotique, fichier vide...) ou si l'en-tête
+    a des noms vides / dupliqués (pandas les renomme en 'Unnamed: i' / 'x.1')
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    from pandas._libs.parsers import STR_NA_VALUES
+    
+    read_options = pacsv.ReadOptions(use_threads=True, block_size=64 << 20)
+    null_values = sorted(STR_NA_VALUES)
+    
+    try:
+        table = pacsv.read_csv(
+            uploaded_file,
+            read_options=read_options,
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True, null_values=null_values)
+        )
+        
+        names = table.column_names
+        if '' in names or len(set(names)) != len(names):
+            raise ValueError("en-tête à renommer : laissé à pd.read_csv")
+        
+        # pd.read_csv laisse les dates en texte : relire ces colonnes en chaînes
+        temporal = [field.name for field in table.schema
+                    if pa.types.is_temporal(field.type)]
+        if temporal:
+            uploaded_file.seek(0)
+            table = pacsv.read_csv(
+                uploaded_file,
+                read_options=read_options,
+                convert_options=pacsv.ConvertOptions(
+                    strings_can_be_null=True,
+                    null_values=null_values,
+                    column_types={name: pa.string() for name in temporal}
+                )
+            )
+        
+        # Types numpy classiques : le reste du pipeline (select_dtypes) en dépend
+        df = table.to_pandas()
+        
+        # Colonnes sans aucune valeur : float64 comme pd.read_csv (pas object)
+        null_cols = [field.name for field in table.schema if pa.types.is_null(field.type)]
+        if null_cols:
+            df[null_cols] = df[null_cols].astype('float64')
+        return df
+    except (pa.ArrowException, ValueError):
+        try:
+            uploaded_file.seek(0)
+        except:
+            pass
+        return pd.read_csv(uploaded_file)
+
+
 def detect_encoding(file_path: str) -> str:
     """
     Détecte l'encodage d'un fichier (utile pour CSV)
@@ -85,12 +164,13 @@ def detect_encoding(file_path: str) -> str:
     Returns:
         str: Encodage détecté (utf-8, latin1, etc.)
     """
-    import chardet
+    from charset_normalizer import from_bytes
     
     try:
+        # Échantillon de 64 Ko : suffisant pour détecter, quelle que soit la taille du fichier
         with open(file_path, 'rb') as f:
-            result = chardet.detect(f.read())
-            return result['encoding']
+            best = from_bytes(f.read(65536)).best()
+            return best.encoding if best is not None else 'utf-8'
     except:
         return 'utf-8'  # Fallback
 
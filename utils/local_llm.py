@@ -4,26 +4,45 @@ Version complète corrigée
 """
 
 import requests
-import json
-from typing import List, Dict, Any, Optional, Tuple
+from requests.adapters import HTTPAdapter
+import orjson
+import time
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+
+# Session HTTP partagée : connexions keep-alive réutilisées vers Ollama
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+_SESSION.headers.update({"Connection": "keep-alive"})
 
 
 def check_ollama_available() -> bool:
     """Vérifie si Ollama est disponible"""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = _SESSION.get("http://localhost:11434/api/tags", timeout=5)
         return response.status_code == 200
     except:
         return False
 
 
+# Durée de validité de la liste des modèles (secondes)
+_MODELS_TTL = 30
+
+
 def list_ollama_models() -> List[str]:
-    """Liste les modèles Ollama disponibles"""
+    """Liste les modèles Ollama disponibles (mise en cache 30 s)"""
+    return list(_list_ollama_models_cached(int(time.monotonic() // _MODELS_TTL)))
+
+
+@lru_cache(maxsize=1)
+def _list_ollama_models_cached(time_bucket: int) -> Tuple[str, ...]:
+    """Interroge Ollama une fois par tranche de _MODELS_TTL secondes"""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = _SESSION.get("http://localhost:11434/api/tags", timeout=5)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             models = data.get('models', [])
             
             model_names = []
@@ -32,10 +51,27 @@ def list_ollama_models() -> List[str]:
                 if name:
                     model_names.append(name)
             
-            return model_names
-        return []
+            return tuple(model_names)
+        return ()
     except:
-        return []
+        return ()
+
+
+# Timeouts par taille (premier motif trouvé, dans l'ordre : petits modèles d'abord)
+_SIZE_TIMEOUTS = {
+    '1b': 240,    # 4 minutes (modèles 1B sont rapides)
+    '3b': 300,    # 5 minutes (modèles 3B)
+    'mini': 300,
+    '7b': 600,    # 10 minutes
+    '8b': 600,
+    '13b': 600,
+}
+
+# :latest (taille inconnue) : deviner selon le nom de base
+_LATEST_TIMEOUTS = {
+    'mistral': 600,   # 10 minutes (probablement 7B+)
+    'llama3.1': 600,
+}
 
 
 def get_model_timeout(model_name: str) -> int:
@@ -51,28 +87,20 @@ def get_model_timeout(model_name: str) -> int:
     """
     model_lower = model_name.lower()
     
-    # PRIORITÉ 1 : Petits modèles (même si :latest)
-    if '1b' in model_lower:
-        return 240  # 4 minutes (modèles 1B sont rapides)
-    
-    elif '3b' in model_lower or 'mini' in model_lower:
-        return 300  # 5 minutes (modèles 3B)
-    
-    # PRIORITÉ 2 : Gros modèles connus
-    elif any(x in model_lower for x in ['7b', '8b', '13b']):
-        return 600  # 10 minutes
+    # PRIORITÉ 1 et 2 : taille connue
+    for pattern, timeout in _SIZE_TIMEOUTS.items():
+        if pattern in model_lower:
+            return timeout
     
     # PRIORITÉ 3 : :latest (on ne connaît pas la taille)
-    elif 'latest' in model_lower:
-        # Deviner selon le nom de base
-        if 'mistral' in model_lower or 'llama3.1' in model_lower:
-            return 600  # 10 minutes (probablement 7B+)
-        else:
-            return 420  # 7 minutes (prudent)
+    if 'latest' in model_lower:
+        for family, timeout in _LATEST_TIMEOUTS.items():
+            if family in model_lower:
+                return timeout
+        return 420  # 7 minutes (prudent)
     
     # Par défaut
-    else:
-        return 360  # 6 minutes
+    return 360  # 6 minutes
 
 
 def estimate_generation_time(model_name: str) -> str:
@@ -103,38 +131,14 @@ def estimate_generation_time(model_name: str) -> str:
         return "~2-3 minutes"
 
 
-def generate_local_insights(analysis: Dict[str, Any], lang: str = 'fr', 
-                           model: str = 'llama3.2:3b',
-                           timeout: Optional[int] = None) -> Dict[str, Any]:
-    """
-    Génère des insights avec Ollama
-    CORRECTION : Meilleure détection de timeout + remplissage champs vides
-    """
-    try:
-        # Timeout automatique si non spécifié
-        if timeout is None:
-            timeout = get_model_timeout(model)
-        
-        print(f"DEBUG - Modèle: {model}, Timeout: {timeout}s")
-        
-        # Préparer statistiques (COURT)
-        stats_text = ""
-        if 'numeric_stats' in analysis and not analysis['numeric_stats'].empty:
-            stats_text = f"Stats:\n{analysis['numeric_stats'].to_string()[:300]}"
-        
-        lang_instruction = "en français" if lang == 'fr' else "in English"
-        
-        # Résumé COURT
-        stats_summary = f"""
-Dataset: {analysis['shape'][0]} rows, {analysis['shape'][1]} cols
-Numeric: {len(analysis['numeric_cols'])} | Categorical: {len(analysis['categorical_cols'])}
+# Prompt Ollama (TRÈS COURT : moins de tokens = génération plus rapide)
+_PROMPT_TEMPLATE = """Quick analysis {lang_instruction}. JSON only (no text, no markdown):
+
+
+Dataset: {rows} rows, {cols} cols
+Numeric: {n_numeric} | Categorical: {n_categorical}
 {stats_text}
-"""
-        
-        # Prompt TRÈS COURT (important pour performance)
-        prompt = f"""Quick analysis {lang_instruction}. JSON only (no text, no markdown):
 
-{stats_summary}
 
 {{
   "resume_executif": "2 sentences",
@@ -150,6 +154,93 @@ Numeric: {len(analysis['numeric_cols'])} | Categorical: {len(analysis['categoric
   ],
   "conclusion": "1-2 sentences"
 }}"""
+
+
+def stream_ollama_generate(model: str, prompt: str, options: Dict[str, Any], timeout: float,
+                           progress_callback: Optional[Callable[[float], None]] = None) -> str:
+    """
+    Appelle /api/generate en streaming et renvoie le texte complet
+    
+    timeout reste une limite de durée TOTALE (horloge monotone vérifiée à chaque token),
+    comme l'ancien appel non streamé ; progress_callback (ex. st.progress(...).progress)
+    reçoit une fraction 0-1 estimée d'après le nombre de tokens / num_predict
+    
+    Raises:
+        requests.exceptions.Timeout: durée totale dépassée
+    """
+    deadline = time.monotonic() + timeout
+    num_predict = options.get("num_predict") or 1
+    
+    response = _SESSION.post(
+        "http://localhost:11434/api/generate",
+        json={
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "format": "json",
+            "options": options
+        },
+        stream=True,
+        timeout=timeout
+    )
+    
+    with response:
+        if response.status_code != 200:
+            raise Exception(f"Ollama status {response.status_code}: {response.text[:200]}")
+        
+        text_parts = []
+        for line in response.iter_lines():
+            if time.monotonic() > deadline:
+                raise requests.exceptions.Timeout(f"Ollama: génération > {timeout}s")
+            if not line:
+                continue
+            chunk = orjson.loads(line)
+            text_parts.append(chunk.get('response', ''))
+            
+            if progress_callback is not None:
+                progress_callback(min(len(text_parts) / num_predict, 1.0))
+            
+            if chunk.get('done'):
+                break
+    
+    if progress_callback is not None:
+        progress_callback(1.0)
+    return ''.join(text_parts).strip()
+
+
+def generate_local_insights(analysis: Dict[str, Any], lang: str = 'fr', 
+                           model: str = 'llama3.2:3b',
+                           timeout: Optional[int] = None,
+                           progress_callback: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
+    """
+    Génère des insights avec Ollama
+    CORRECTION : Meilleure détection de timeout + remplissage champs vides
+    
+    La réponse est lue en streaming (voir stream_ollama_generate) : timeout borne la durée
+    totale, progress_callback reçoit l'avancement 0-1
+    """
+    try:
+        # Timeout automatique si non spécifié
+        if timeout is None:
+            timeout = get_model_timeout(model)
+        
+        print(f"DEBUG - Modèle: {model}, Timeout: {timeout}s")
+        
+        # Préparer statistiques (COURT) : tronquer le tableau AVANT de le sérialiser
+        stats_text = ""
+        stats = analysis.get('numeric_stats')
+        if stats is not None and not stats.empty:
+            stats_text = "Stats:\n" + stats.iloc[:, :5].round(3).to_string(max_rows=8, max_cols=5)
+        
+        # Prompt TRÈS COURT (important pour performance)
+        prompt = _PROMPT_TEMPLATE.format(
+            lang_instruction="en français" if lang == 'fr' else "in English",
+            rows=analysis['shape'][0],
+            cols=analysis['shape'][1],
+            n_numeric=len(analysis['numeric_cols']),
+            n_categorical=len(analysis['categorical_cols']),
+            stats_text=stats_text,
+        )
         
         # Options optimisées pour RAPIDITÉ
         options = {
@@ -160,24 +251,8 @@ Numeric: {len(analysis['numeric_cols'])} | Categorical: {len(analysis['categoric
             "num_ctx": 2048
         }
         
-        # Appel Ollama
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "format": "json",
-                "options": options
-            },
-            timeout=timeout
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Ollama status {response.status_code}: {response.text[:200]}")
-        
-        result = response.json()
-        text = result.get('response', '{}').strip()
+        # Appel Ollama en streaming, durée totale bornée par timeout
+        text = stream_ollama_generate(model, prompt, options, timeout, progress_callback) or '{}'
         
         print(f"DEBUG - Réponse reçue: {len(text)} caractères")
         
@@ -185,7 +260,7 @@ Numeric: {len(analysis['numeric_cols'])} | Categorical: {len(analysis['categoric
         text = text.replace('```json', '').replace('```', '').strip()
         
         # Parser
-        insights = json.loads(text)
+        insights = orjson.loads(text)
         
         # CORRECTION : Validation ET remplissage si vide
         required_fields = {
@@ -244,7 +319,7 @@ Numeric: {len(analysis['numeric_cols'])} | Categorical: {len(analysis['categoric
             else f"⏰ Timeout after {timeout}s. Try llama3.2:3b"
         )
     
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"DEBUG - Erreur JSON: {e}")
         print(f"DEBUG - Texte reçu: {text[:500] if 'text' in locals() else 'N/A'}")
         raise Exception(
@@ -262,12 +337,12 @@ Numeric: {len(analysis['numeric_cols'])} | Categorical: {len(analysis['categoric
 def test_ollama_connection() -> Tuple[bool, str]:
     """Test la connexion Ollama"""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=3)
+        response = _SESSION.get("http://localhost:11434/api/tags", timeout=3)
         
         if response.status_code != 200:
             return False, f"Status {response.status_code}"
         
-        data = response.json()
+        data = orjson.loads(response.content)
         models = data.get('models', [])
         
         if not models:
@@ -281,57 +356,73 @@ def test_ollama_connection() -> Tuple[bool, str]:
         return False, "❌ Ollama non connecté"
 
 
+# Modèles recommandés (constante, copiée à chaque appel)
+_RECOMMENDED_MODELS = [
+    {
+        "name": "llama3.2:1b",
+        "size": "1.3 GB",
+        "speed": "⚡ 30-60s",
+        "description": "Le plus rapide"
+    },
+    {
+        "name": "llama3.2:3b",
+        "size": "2.0 GB",
+        "speed": "🚀 1-2 min",
+        "description": "⭐ RECOMMANDÉ"
+    },
+    {
+        "name": "mistral:7b",
+        "size": "4.1 GB",
+        "speed": "🐌 3-5 min",
+        "description": "Qualité mais LENT"
+    },
+    {
+        "name": "mistral:latest",
+        "size": "~4 GB",
+        "speed": "🐌 3-5 min",
+        "description": "Mistral latest (LENT)"
+    }
+]
+
+
 def get_recommended_models() -> List[Dict[str, str]]:
     """Liste des modèles recommandés"""
-    return [
-        {
-            "name": "llama3.2:1b",
-            "size": "1.3 GB",
-            "speed": "⚡ 30-60s",
-            "description": "Le plus rapide"
-        },
-        {
-            "name": "llama3.2:3b",
-            "size": "2.0 GB",
-            "speed": "🚀 1-2 min",
-            "description": "⭐ RECOMMANDÉ"
-        },
-        {
-            "name": "mistral:7b",
-            "size": "4.1 GB",
-            "speed": "🐌 3-5 min",
-            "description": "Qualité mais LENT"
-        },
-        {
-            "name": "mistral:latest",
-            "size": "~4 GB",
-            "speed": "🐌 3-5 min",
-            "description": "Mistral latest (LENT)"
-        }
-    ]
+    return [dict(model) for model in _RECOMMENDED_MODELS]
+
+
+# Familles de modèles : préfixe Ollama -> nom affiché
+_MODEL_PREFIXES = {
+    'llama': 'Llama',
+    'mistral': 'Mistral',
+    'gemma': 'Gemma',
+    'qwen': 'Qwen',
+}
 
 
 def format_model_name(raw_name: str) -> str:
-    """Formatte un nom de modèle"""
-    parts = raw_name.split(':')
+    """Formatte un nom de modèle ('llama3.2:3b-instruct' -> 'Llama3.2 (3b)')"""
+    base, sep, tag = raw_name.partition(':')
+    if not sep:
+        return raw_name
     
-    if len(parts) >= 2:
-        base = parts[0].replace('llama', 'Llama').replace('mistral', 'Mistral')
-        version = parts[1].split('-')[0]
-        return f"{base} ({version})"
+    for prefix, pretty in _MODEL_PREFIXES.items():
+        if base.startswith(prefix):
+            base = pretty + base[len(prefix):]
+            break
     
-    return raw_name
+    version = tag.split(':', 1)[0].split('-', 1)[0]
+    return f"{base} ({version})"
 
 
 def get_model_info(model_name: str) -> Optional[Dict[str, Any]]:
     """Obtient les infos d'un modèle"""
     try:
-        response = requests.post(
+        response = _SESSION.post(
             "http://localhost:11434/api/show",
             json={"name": model_name},
             timeout=5
         )
-        return response.json() if response.status_code == 200 else None
+        return orjson.loads(response.content) if response.status_code == 200 else None
     except:
         return None
 
@@ -339,7 +430,7 @@ def get_model_info(model_name: str) -> Optional[Dict[str, Any]]:
 def pull_model(model_name: str) -> Tuple[bool, str]:
     """Télécharge un modèle"""
     try:
-        response = requests.post(
+        response = _SESSION.post(
             "http://localhost:11434/api/pull",
             json={"name": model_name},
             stream=True,
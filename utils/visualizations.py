@@ -3,16 +3,133 @@ Module de création des visualisations avec Matplotlib
 VERSION INTELLIGENTE : Exclut automatiquement colonnes vides/quasi-vides (≥90%)
 """
 
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use("Agg")  # Rendu serveur : pas de backend GUI
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import seaborn as sns
 import pandas as pd
 import numpy as np
+import io
+import os
+import re
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Tuple, List, Any, Optional
 
-# Configuration du style
-sns.set_style("whitegrid")
-plt.rcParams['figure.facecolor'] = 'white'
-plt.rcParams['axes.facecolor'] = 'white'
+_STYLE_CONFIGURED = False
+
+
+def _configure_style():
+    """Configuration du style (appliquée une seule fois par processus)"""
+    global _STYLE_CONFIGURED
+    if _STYLE_CONFIGURED:
+        return
+    sns.set_style("whitegrid")
+    matplotlib.rcParams['figure.facecolor'] = 'white'
+    matplotlib.rcParams['axes.facecolor'] = 'white'
+    _STYLE_CONFIGURED = True
+
+
+_configure_style()
+
+# Au-delà, les points dessinés par les boxplots sont échantillonnés ; les stats restent calculées sur tout
+MAX_POINTS = 50_000
+
+# À partir de cette taille, les calculs NumPy/pandas sont répartis sur des threads
+# (les Figures restent construites séquentiellement sur le thread appelant)
+PARALLEL_MIN_ROWS = 200_000
+
+# Stratégie par taille de DataFrame : calculs parallèles ou non
+_SIZE_PROFILES = {
+    'standard': {'parallel': False},
+    'large': {'parallel': True},
+}
+
+
+def _size_profile(n_rows: int) -> Dict[str, Any]:
+    """Profil d'exécution selon le nombre de lignes"""
+    if n_rows >= PARALLEL_MIN_ROWS:
+        return _SIZE_PROFILES['large']
+    return _SIZE_PROFILES['standard']
+
+
+def _new_figure(figsize: Tuple[float, float], nrows: int = 1, ncols: int = 1):
+    """
+    Crée une figure Agg hors pyplot (pas d'état global retenu entre les rapports).
+    La mise en page est confiée à constrained_layout (plus rapide que tight_layout).
+    
+    Returns:
+        (Figure, axes): comme plt.subplots
+    """
+    fig = Figure(figsize=figsize, constrained_layout=True)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols)
+
+
+def _new_grid_figure(n_plots: int):
+    """
+    Grille de 1 à 4 graphiques (2 par ligne) dimensionnée au nombre réel de colonnes
+    
+    Returns:
+        (Figure, axes): axes toujours à plat (tableau 1D)
+    """
+    n_plots = max(1, min(n_plots, 4))
+    nrows = (n_plots + 1) // 2
+    ncols = min(n_plots, 2)
+    fig, axes = _new_figure((7 * ncols, 5 * nrows), nrows, ncols)
+    return fig, np.atleast_1d(axes).ravel()
+
+
+# PNG déjà encodés par figure : aperçu HTML, export HTML et Word réutilisent les mêmes octets
+_PNG_CACHE: "weakref.WeakKeyDictionary[Figure, Dict[int, bytes]]" = weakref.WeakKeyDictionary()
+
+
+def figure_to_png(fig: Figure, dpi: int = 150) -> bytes:
+    """
+    Encode une figure en PNG (mis en cache tant que la figure existe)
+    
+    Pas de bbox_inches='tight' : constrained_layout ajuste déjà les marges,
+    on évite ainsi une seconde passe de rendu à chaque export.
+    """
+    by_dpi = _PNG_CACHE.setdefault(fig, {})
+    png = by_dpi.get(dpi)
+    if png is None:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, bbox_inches=None)
+        png = by_dpi[dpi] = buffer.getvalue()
+    return png
+
+
+def _rotate_xticklabels(ax, rotation: float = 45, ha: str = 'right'):
+    """Équivalent de plt.xticks(rotation=..., ha=...) sur un axe donné"""
+    for label in ax.get_xticklabels():
+        label.set_rotation(rotation)
+        label.set_ha(ha)
+
+
+def _subsample(data: np.ndarray, max_points: int = MAX_POINTS) -> np.ndarray:
+    """Échantillon reproductible (sans remise) si le tableau dépasse max_points"""
+    if data.size > max_points:
+        return np.random.default_rng(0).choice(data, max_points, replace=False)
+    return data
+
+
+def _dropna_arrays(df: pd.DataFrame, cols: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Valeurs non manquantes de chaque colonne, extraites une seule fois
+    et partagées par les graphiques (histogrammes, barres, boxplots)
+    """
+    arrays = {}
+    for col in cols:
+        arr = df[col].to_numpy(copy=False)
+        if arr.dtype.kind == 'f':
+            arr = arr[~np.isnan(arr)]
+        elif arr.dtype.kind not in 'iu':
+            # Types nullables / object : laisser pandas gérer les NA
+            arr = df[col].dropna().to_numpy()
+        arrays[col] = arr
+    return arrays
 
 
 def classify_numeric_column(df: pd.DataFrame, col: str) -> str:
@@ -26,29 +143,48 @@ def classify_numeric_column(df: pd.DataFrame, col: str) -> str:
     Returns:
         str: 'continuous', 'discrete', 'binary', 'ordinal'
     """
-    unique_count = df[col].nunique()
-    total_count = len(df[col].dropna())
-    
-    if total_count == 0:
-        return 'empty'
-    
-    variety_ratio = unique_count / total_count if total_count > 0 else 0
+    return classify_numeric_columns(df, [col])[col]
+
+
+def classify_numeric_columns(df: pd.DataFrame, cols: List[str]) -> Dict[str, str]:
+    """
+    Classifie plusieurs colonnes numériques en une seule passe vectorisée
     
-    # Binaire (0/1, True/False, etc.)
-    if unique_count == 2:
-        return 'binary'
+    Args:
+        df: DataFrame
+        cols: Noms des colonnes
+        
+    Returns:
+        dict: {colonne: 'continuous' | 'discrete' | 'binary' | 'empty'}
+    """
+    if not cols:
+        return {}
     
-    # Discrète (peu de valeurs, souvent des catégories encodées)
-    elif unique_count <= 5:
-        return 'discrete'
+    subset = df[cols]
+    unique_count = subset.nunique(dropna=True).to_numpy()
+    total_count = subset.count().to_numpy()
     
-    # Continue (beaucoup de valeurs différentes OU ratio de variété élevé)
-    elif variety_ratio > 0.3 or unique_count > 15:
-        return 'continuous'
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variety_ratio = np.where(total_count > 0, unique_count / total_count, 0.0)
     
-    # Ordinale/discrète par défaut
-    else:
-        return 'discrete'
+    # Mêmes règles que la version colonne par colonne, dans le même ordre
+    kinds = np.select(
+        [
+            total_count == 0,
+            unique_count == 2,                                # Binaire
+            unique_count <= 5,                                # Discrète
+            (variety_ratio > 0.3) | (unique_count > 15),      # Continue
+        ],
+        ['empty', 'binary', 'discrete', 'continuous'],
+        default='discrete'                                    # Ordinale/discrète
+    )
+    return dict(zip(cols, kinds.tolist()))
+
+
+# Colonnes d'identifiants : mot-clé isolé (user_id, Index, Unnamed: 0) ou suffixe camelCase (userId)
+_ID_COLUMN_RE = re.compile(
+    r'(?i:(?:^|[\W_])(?:id|index|key|uuid|guid|unnamed)(?:[\W_]|$))|[a-z](?:Id|ID|Key|Index)$'
+)
 
 
 def filter_useful_columns(cols: List[str], df: pd.DataFrame, 
@@ -57,40 +193,63 @@ def filter_useful_columns(cols: List[str], df: pd.DataFrame,
     Filtre les colonnes utiles en excluant les problématiques
     ✅ Paramètre exclude_cols pour colonnes vides/quasi-vides
     """
-    if exclude_cols is None:
-        exclude_cols = []
+    exclude_set = set(exclude_cols or [])
     
-    ignored_keywords = ['id', 'index', 'key', '_id', 'uuid', 'guid', 'unnamed']
-    useful = []
+    # ✅ 1. EXCLURE LES COLONNES VIDES/QUASI-VIDES, puis les IDs (une regex compilée)
+    candidates = [c for c in cols if c not in exclude_set and not _ID_COLUMN_RE.search(str(c))]
     
-    for col in cols:
-        # ✅ 1. EXCLURE LES COLONNES VIDES/QUASI-VIDES
-        if col in exclude_cols:
-            continue
-        
-        col_lower = str(col).lower()
-        
-        # Ignorer les IDs
-        is_id = any(keyword in col_lower for keyword in ignored_keywords)
-        if is_id:
-            continue
-        
-        # Vérifier la variance (pour colonnes numériques)
-        if col in df.select_dtypes(include=[np.number]).columns:
-            try:
-                variance = df[col].var()
-                if variance == 0 or pd.isna(variance):
-                    continue
-            except:
-                pass
-        
-        useful.append(col)
+    # 2. Variance nulle ou indéfinie : un seul var() vectorisé sur les candidates numériques
+    numeric_set = set(df.select_dtypes(include=[np.number]).columns)
+    numeric_candidates = [c for c in candidates if c in numeric_set]
+    zero_var = set()
+    if numeric_candidates:
+        try:
+            variance_ser = df[numeric_candidates].var()
+            zero_var = set(variance_ser.index[(variance_ser == 0) | variance_ser.isna()])
+        except Exception:
+            pass
+    
+    useful = [c for c in candidates if c not in zero_var]
     
     return useful if useful else []
 
 
+def _correlation_matrix(corr_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Corrélations de Pearson sur toutes les lignes (mêmes r que analyze_dataframe).
+    Sans valeur manquante : un seul np.corrcoef ; sinon corr() de pandas (paires complètes).
+    """
+    values = corr_df.to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(values).any():
+        return corr_df.corr()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.corrcoef(values, rowvar=False)
+    return pd.DataFrame(corr, index=corr_df.columns, columns=corr_df.columns)
+
+
+def _compute_aggregates(df: pd.DataFrame, numeric_cols: List[str], corr_df: Optional[pd.DataFrame],
+                        parallel: bool) -> Tuple[Dict[str, np.ndarray], Optional[pd.DataFrame]]:
+    """
+    Calculs partagés par les graphiques : valeurs sans NaN par colonne et matrice de corrélation.
+    Sur les gros fichiers ils tournent dans un pool de threads (NumPy/pandas relâchent le GIL) ;
+    la construction des Figures Matplotlib, non thread-safe, reste hors de ce pool.
+    
+    Returns:
+        (arrays, corr_matrix): corr_matrix vaut None si corr_df est None
+    """
+    if not parallel:
+        return _dropna_arrays(df, numeric_cols), (_correlation_matrix(corr_df) if corr_df is not None else None)
+    
+    workers = min(len(numeric_cols) + 1, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="viz") as executor:
+        corr_future = executor.submit(_correlation_matrix, corr_df) if corr_df is not None else None
+        array_futures = {col: executor.submit(_dropna_arrays, df, [col]) for col in numeric_cols}
+        arrays = {col: future.result()[col] for col, future in array_futures.items()}
+        return arrays, (corr_future.result() if corr_future is not None else None)
+
+
 def create_visualizations(df: pd.DataFrame, lang: str = 'fr',
-                         exclude_cols: Optional[List[str]] = None) -> Dict[str, Tuple[plt.Figure, str]]:
+                         exclude_cols: Optional[List[str]] = None) -> Dict[str, Tuple[Figure, str]]:
     """
     Crée toutes les visualisations en excluant colonnes vides/quasi-vides
     
@@ -118,7 +277,7 @@ def create_visualizations(df: pd.DataFrame, lang: str = 'fr',
         return figs
     
     # Classifier les colonnes numériques
-    numeric_types = {col: classify_numeric_column(df, col) for col in useful_numeric}
+    numeric_types = classify_numeric_columns(df, useful_numeric)
     
     # Séparer par type
     continuous_cols = [c for c, t in numeric_types.items() if t == 'continuous']
@@ -128,82 +287,95 @@ def create_visualizations(df: pd.DataFrame, lang: str = 'fr',
     # Traductions
     t = _get_translations(lang)
     
+    profile = _size_profile(len(df))
+    
+    # Matrice de corrélation (seulement continues)
+    corr_cols = continuous_cols[:10] if len(continuous_cols) >= 2 else []
+    corr_df = df[corr_cols] if corr_cols else None
+    
+    # Valeurs non manquantes extraites une fois pour tous les graphiques numériques
+    arrays, corr_matrix = _compute_aggregates(df, useful_numeric, corr_df, profile['parallel'])
+    
+    # Colonne catégorielle analysée (barplot + camembert) : passage en 'category' une seule fois,
+    # value_counts/groupby travaillent ensuite sur les codes entiers
+    if useful_categorical and not isinstance(df[useful_categorical[0]].dtype, pd.CategoricalDtype):
+        df = df.copy(deep=False)
+        df[useful_categorical[0]] = df[useful_categorical[0]].astype('category')
+    
+    # Chaque graphique est une tâche indépendante (nom, fonction, arguments)
+    tasks = []
+    
     # 1. Distribution des variables CONTINUES (Histogrammes)
     if continuous_cols:
-        fig, interp = _create_distributions(df, continuous_cols[:4], t)
-        if fig:
-            figs['continuous_distributions'] = (fig, interp)
+        tasks.append(('continuous_distributions', _create_distributions, (df, continuous_cols[:4], t, arrays)))
     
     # 2. Distribution des variables DISCRÈTES (Bar charts)
     if discrete_cols:
-        fig, interp = _create_discrete_distributions(df, discrete_cols[:4], t)
-        if fig:
-            figs['discrete_distributions'] = (fig, interp)
+        tasks.append(('discrete_distributions', _create_discrete_distributions, (df, discrete_cols[:4], t, arrays)))
     
     # 3. Boxplots - Mixte continues/discrètes si besoin
     boxplot_cols = continuous_cols[:6] if continuous_cols else []
     
     # Si pas assez de continues, ajouter des discrètes
     if len(boxplot_cols) < 2 and discrete_cols:
-        discrete_sorted = sorted(discrete_cols, key=lambda c: df[c].nunique(), reverse=True)
+        nunique_ser = df[discrete_cols].nunique()
+        discrete_sorted = nunique_ser.sort_values(ascending=False, kind='stable').index.tolist()
         needed = min(6 - len(boxplot_cols), len(discrete_sorted))
         boxplot_cols.extend(discrete_sorted[:needed])
     
     if boxplot_cols and len(boxplot_cols) >= 1:
-        fig, interp = _create_boxplots(df, boxplot_cols, t)
-        if fig:
-            figs['outlier_detection'] = (fig, interp)
+        tasks.append(('outlier_detection', _create_boxplots, (df, boxplot_cols, t, arrays)))
     
     # 4. Matrice de corrélation (seulement continues)
-    if len(continuous_cols) >= 2:
-        fig, interp = _create_correlation_matrix(df, continuous_cols[:10], t)
-        if fig:
-            figs['correlation_matrix'] = (fig, interp)
+    if corr_matrix is not None:
+        tasks.append(('correlation_matrix', _create_correlation_matrix, (corr_df, corr_cols, t, corr_matrix)))
     
     # 5. Analyse catégorielle vs numérique
     if useful_categorical and useful_numeric:
-        fig, interp = _create_categorical_analysis(df, useful_categorical[0], useful_numeric[0], t)
-        if fig:
-            figs['categorical_analysis'] = (fig, interp)
+        tasks.append(('categorical_analysis', _create_categorical_analysis,
+                      (df, useful_categorical[0], useful_numeric[0], t)))
     
     # 6. Relation intelligente entre variables
     if len(continuous_cols) >= 2:
-        fig, interp = _create_scatter_plot(df, continuous_cols[0], continuous_cols[1], t)
-        if fig:
-            figs['relationship_scatter'] = (fig, interp)
+        tasks.append(('relationship_scatter', _create_scatter_plot, (df, continuous_cols[0], continuous_cols[1], t)))
     
     # 7. Analyse groupée si discrète + continue
     if discrete_cols and continuous_cols:
-        fig, interp = _create_grouped_boxplot(df, discrete_cols[0], continuous_cols[0], t)
-        if fig:
-            figs['grouped_analysis'] = (fig, interp)
+        tasks.append(('grouped_analysis', _create_grouped_boxplot, (df, discrete_cols[0], continuous_cols[0], t)))
     
     # 8. Distribution catégorielle (pie chart)
     if useful_categorical:
-        fig, interp = _create_pie_chart(df, useful_categorical[0], t)
+        tasks.append(('categorical_distribution', _create_pie_chart, (df, useful_categorical[0], t)))
+    
+    # Figures construites sur le thread appelant : Matplotlib n'est pas thread-safe
+    for name, func, args in tasks:
+        fig, interp = func(*args)
         if fig:
-            figs['categorical_distribution'] = (fig, interp)
+            figs[name] = (fig, interp)
     
     return figs
 
 
-def _create_distributions(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[plt.Figure, str]:
+def _create_distributions(df: pd.DataFrame, cols: List[str], t: Dict,
+                          arrays: Optional[Dict[str, np.ndarray]] = None) -> Tuple[Figure, str]:
     """Crée les histogrammes pour variables CONTINUES"""
     try:
-        n_cols = min(len(cols), 4)
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        if arrays is None:
+            arrays = _dropna_arrays(df, cols[:4])
+        fig, axes = _new_grid_figure(len(cols))
         fig.suptitle(t['dist_title_continuous'], fontsize=16, fontweight='bold')
-        axes = axes.flatten()
         
         for idx, col in enumerate(cols[:4]):
             if idx >= len(axes):
                 break
             
             ax = axes[idx]
-            data = df[col].dropna()
+            data = arrays[col]
             
             if len(data) > 0:
-                ax.hist(data, bins=30, color='#667eea', alpha=0.7, edgecolor='black')
+                # Comptage sur toutes les valeurs, dessin en O(bins)
+                counts, edges = np.histogram(data, bins=30)
+                ax.hist(edges[:-1], edges, weights=counts, color='#667eea', alpha=0.7, edgecolor='black')
                 ax.set_title(f'{col}', fontsize=12, fontweight='bold')
                 ax.set_xlabel(t['value'], fontsize=10)
                 ax.set_ylabel(t['frequency'], fontsize=10)
@@ -211,16 +383,15 @@ def _create_distributions(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[p
                 
                 # Stats
                 mean_val = data.mean()
-                median_val = data.median()
+                median_val = np.median(data)
                 ax.axvline(mean_val, color='red', linestyle='--', linewidth=2, label=f'Mean: {mean_val:.2f}')
                 ax.axvline(median_val, color='green', linestyle='--', linewidth=2, label=f'Median: {median_val:.2f}')
                 ax.legend(fontsize=8)
         
-        # Masquer les axes vides
+        # Masquer la case vide (nombre impair de colonnes)
         for idx in range(len(cols), len(axes)):
             axes[idx].set_visible(False)
         
-        plt.tight_layout()
         return fig, t['dist_desc_continuous']
         
     except Exception as e:
@@ -228,23 +399,24 @@ def _create_distributions(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[p
         return None, ""
 
 
-def _create_discrete_distributions(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[plt.Figure, str]:
+def _create_discrete_distributions(df: pd.DataFrame, cols: List[str], t: Dict,
+                                   arrays: Optional[Dict[str, np.ndarray]] = None) -> Tuple[Figure, str]:
     """Crée des bar charts pour variables DISCRÈTES"""
     try:
-        n_cols = min(len(cols), 4)
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        if arrays is None:
+            arrays = _dropna_arrays(df, cols[:4])
+        fig, axes = _new_grid_figure(len(cols))
         fig.suptitle(t['dist_title_discrete'], fontsize=16, fontweight='bold')
-        axes = axes.flatten()
         
         for idx, col in enumerate(cols[:4]):
             if idx >= len(axes):
                 break
             
             ax = axes[idx]
-            data = df[col].dropna()
+            data = arrays[col]
             
             if len(data) > 0:
-                value_counts = data.value_counts().sort_index()
+                value_counts = pd.Series(data).value_counts().sort_index()
                 
                 bars = ax.bar(range(len(value_counts)), value_counts.values, 
                              color='#764ba2', alpha=0.7, edgecolor='black')
@@ -258,16 +430,12 @@ def _create_discrete_distributions(df: pd.DataFrame, cols: List[str], t: Dict) -
                 ax.grid(True, alpha=0.3, axis='y')
                 
                 # Ajouter les counts sur les barres
-                for bar in bars:
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2., height,
-                           f'{int(height)}', ha='center', va='bottom', fontsize=9)
+                ax.bar_label(bars, labels=[f'{int(h)}' for h in value_counts.values], padding=2, fontsize=9)
         
-        # Masquer les axes vides
+        # Masquer la case vide (nombre impair de colonnes)
         for idx in range(len(cols), len(axes)):
             axes[idx].set_visible(False)
         
-        plt.tight_layout()
         return fig, t['dist_desc_discrete']
         
     except Exception as e:
@@ -275,32 +443,31 @@ def _create_discrete_distributions(df: pd.DataFrame, cols: List[str], t: Dict) -
         return None, ""
 
 
-def _create_boxplots(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[plt.Figure, str]:
+def _create_boxplots(df: pd.DataFrame, cols: List[str], t: Dict,
+                     arrays: Optional[Dict[str, np.ndarray]] = None) -> Tuple[Figure, str]:
     """
     Boxplots avec affichage de TOUTES les variables avec outliers
     ✅ PAS DE LIMITE À 3 - Affiche toutes (max 10 pour lisibilité)
     """
     try:
-        fig, ax = plt.subplots(figsize=(14, 6))
+        if arrays is None:
+            arrays = _dropna_arrays(df, cols)
+        fig, ax = _new_figure((14, 6))
         
-        data_to_plot = []
-        labels = []
+        labels = [col for col in cols if len(arrays[col]) > 0]
+        data_to_plot = [_subsample(arrays[col]) for col in labels]
         outlier_counts = []
         
-        for col in cols:
-            data = df[col].dropna()
-            if len(data) > 0:
-                data_to_plot.append(data)
-                labels.append(col)
-                
-                Q1 = data.quantile(0.25)
-                Q3 = data.quantile(0.75)
-                IQR = Q3 - Q1
-                outliers = ((data < Q1 - 1.5*IQR) | (data > Q3 + 1.5*IQR)).sum()
-                outlier_counts.append(outliers)
+        # Quartiles et comptage IQR sur les tableaux déjà sans NaN (aucune copie n×k)
+        for col in labels:
+            data = arrays[col]
+            Q1, Q3 = np.quantile(data, [0.25, 0.75])
+            IQR = Q3 - Q1
+            outlier_counts.append(np.count_nonzero((data < Q1 - 1.5*IQR) | (data > Q3 + 1.5*IQR)))
         
         if data_to_plot:
-            bp = ax.boxplot(data_to_plot, labels=labels, patch_artist=True)
+            bp = ax.boxplot(data_to_plot, patch_artist=True)
+            ax.set_xticks(range(1, len(labels) + 1), labels)
             
             for patch in bp['boxes']:
                 patch.set_facecolor('#667eea')
@@ -309,7 +476,7 @@ def _create_boxplots(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[plt.Fi
             ax.set_title(t['outlier_title'], fontsize=14, fontweight='bold')
             ax.set_ylabel(t['value'], fontsize=12)
             ax.grid(True, alpha=0.3, axis='y')
-            plt.xticks(rotation=45, ha='right')
+            _rotate_xticklabels(ax)
             
             # ✅ AFFICHER TOUTES LES VARIABLES (limite 10 pour message)
             total_outliers = sum(outlier_counts)
@@ -329,7 +496,6 @@ def _create_boxplots(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[plt.Fi
             else:
                 interp = t['no_outliers']
             
-            plt.tight_layout()
             return fig, interp
         
         return None, ""
@@ -339,59 +505,56 @@ def _create_boxplots(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[plt.Fi
         return None, ""
 
 
-def _create_correlation_matrix(df: pd.DataFrame, cols: List[str], t: Dict) -> Tuple[plt.Figure, str]:
-    """Crée la matrice de corrélation"""
+def _create_correlation_matrix(df: pd.DataFrame, cols: List[str], t: Dict,
+                               corr_matrix: Optional[pd.DataFrame] = None) -> Tuple[Figure, str]:
+    """Crée la matrice de corrélation (corr_matrix : déjà calculée par _compute_aggregates)"""
     try:
-        fig, ax = plt.subplots(figsize=(12, 10))
+        fig, ax = _new_figure((12, 10))
         
-        corr_matrix = df[cols].corr()
+        if corr_matrix is None:
+            corr_matrix = df[cols].corr()
         corr_matrix = corr_matrix.fillna(0)
         
-        sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='RdBu_r', 
-                   center=0, square=True, ax=ax, cbar_kws={'label': t['correlation']},
-                   vmin=-1, vmax=1)
+        # imshow + une passe d'annotations (plus léger que sns.heatmap)
+        corr_values = corr_matrix.to_numpy()
+        labels = [str(c) for c in corr_matrix.columns]
+        im = ax.imshow(corr_values, cmap='RdBu_r', vmin=-1, vmax=1, aspect='equal')
+        fig.colorbar(im, ax=ax, label=t['correlation'])
+        ax.set_xticks(range(len(labels)), labels)
+        ax.set_yticks(range(len(labels)), labels)
+        ax.grid(False)
+        for (i, j), v in np.ndenumerate(corr_values):
+            ax.text(j, i, f'{v:.2f}', ha='center', va='center', fontsize=9,
+                   color='white' if abs(v) > 0.5 else 'black')
         
         ax.set_title(t['corr_title'], fontsize=14, fontweight='bold')
-        plt.xticks(rotation=45, ha='right')
-        plt.yticks(rotation=0)
-        
-        # Trouver la corrélation la plus forte (hors diagonale)
-        mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-        corr_values = corr_matrix.mask(mask)
-        corr_flat = corr_values.values.flatten()
-        valid_corrs = corr_flat[~np.isnan(corr_flat) & (np.abs(corr_flat) < 0.9999)]
-        
-        if len(valid_corrs) > 0:
-            max_abs_corr = np.max(np.abs(valid_corrs))
-            max_corr_value = valid_corrs[np.abs(valid_corrs) == max_abs_corr][0]
-            
-            found = False
-            for i in range(len(corr_matrix)):
-                for j in range(i + 1, len(corr_matrix)):
-                    if abs(corr_matrix.iloc[i, j] - max_corr_value) < 0.001:
-                        var1 = corr_matrix.index[i]
-                        var2 = corr_matrix.columns[j]
-                        max_corr = max_corr_value
-                        found = True
-                        break
-                if found:
-                    break
+        _rotate_xticklabels(ax)
+        ax.tick_params(axis='y', labelrotation=0)
+        
+        # Trouver la corrélation la plus forte (hors diagonale) en une passe NumPy
+        corr_arr = corr_matrix.to_numpy()
+        rows, cols_idx = np.triu_indices(len(corr_arr), k=1)
+        pair_corrs = corr_arr[rows, cols_idx]
+        abs_corrs = np.abs(pair_corrs)
+        valid = ~np.isnan(pair_corrs) & (abs_corrs < 0.9999)
+        
+        if valid.any():
+            best = np.argmax(np.where(valid, abs_corrs, -1.0))
+            var1 = corr_matrix.index[rows[best]]
+            var2 = corr_matrix.columns[cols_idx[best]]
+            max_corr = pair_corrs[best]
             
-            if found:
-                if abs(max_corr) > 0.7:
-                    strength = t['strong']
-                elif abs(max_corr) > 0.4:
-                    strength = t['moderate']
-                else:
-                    strength = t['weak']
-                
-                interp = f"{t['corr_insight']}: {strength} {t['between']} '{var1}' {t['and']} '{var2}' (r={max_corr:.2f})"
+            if abs(max_corr) > 0.7:
+                strength = t['strong']
+            elif abs(max_corr) > 0.4:
+                strength = t['moderate']
             else:
-                interp = t['corr_insight']
+                strength = t['weak']
+            
+            interp = f"{t['corr_insight']}: {strength} {t['between']} '{var1}' {t['and']} '{var2}' (r={max_corr:.2f})"
         else:
             interp = t['corr_insight']
         
-        plt.tight_layout()
         return fig, interp
         
     except Exception as e:
@@ -399,24 +562,22 @@ def _create_correlation_matrix(df: pd.DataFrame, cols: List[str], t: Dict) -> Tu
         return None, ""
 
 
-def _create_categorical_analysis(df: pd.DataFrame, cat_col: str, num_col: str, t: Dict) -> Tuple[plt.Figure, str]:
+def _create_categorical_analysis(df: pd.DataFrame, cat_col: str, num_col: str, t: Dict) -> Tuple[Figure, str]:
     """Crée un barplot catégorie vs numérique"""
     try:
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = _new_figure((12, 6))
         
-        grouped = df.groupby(cat_col)[num_col].sum().sort_values(ascending=False).head(10)
+        # observed/sort=False : pas de tri de tous les groupes, nlargest suffit pour le top 10
+        grouped = df.groupby(cat_col, observed=True, sort=False)[num_col].sum().nlargest(10)
         
         bars = ax.bar(range(len(grouped)), grouped.values, color='#667eea', alpha=0.8, edgecolor='black')
         ax.set_xticks(range(len(grouped)))
-        ax.set_xticklabels(grouped.index, rotation=45, ha='right')
+        ax.set_xticklabels(grouped.index.astype(str), rotation=45, ha='right')
         ax.set_title(f'{t["top"]} 10 {cat_col} {t["by"]} {num_col}', fontsize=14, fontweight='bold')
         ax.set_ylabel(num_col, fontsize=12)
         ax.grid(True, alpha=0.3, axis='y')
         
-        for i, bar in enumerate(bars):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.0f}', ha='center', va='bottom', fontsize=9)
+        ax.bar_label(bars, labels=[f'{v:.0f}' for v in grouped.values], padding=2, fontsize=9)
         
         top_cat = grouped.index[0]
         top_val = grouped.values[0]
@@ -424,7 +585,6 @@ def _create_categorical_analysis(df: pd.DataFrame, cat_col: str, num_col: str, t
         
         interp = f"{t['key_finding']}: '{top_cat}' {t['leads_with']} {top_val:.0f}. {t['top3']} {top3_pct:.1f}% {t['of_total']}"
         
-        plt.tight_layout()
         return fig, interp
         
     except Exception as e:
@@ -432,19 +592,28 @@ def _create_categorical_analysis(df: pd.DataFrame, cat_col: str, num_col: str, t
         return None, ""
 
 
-def _create_scatter_plot(df: pd.DataFrame, col1: str, col2: str, t: Dict) -> Tuple[plt.Figure, str]:
+def _create_scatter_plot(df: pd.DataFrame, col1: str, col2: str, t: Dict) -> Tuple[Figure, str]:
     """Crée un scatter plot continues vs continues"""
     try:
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _new_figure((10, 6))
         
-        plot_df = df[[col1, col2]].dropna().head(500)
+        clean_df = df[[col1, col2]].dropna()
+        # Échantillon aléatoire (pas les 500 premières lignes) pour l'affichage ;
+        # tendance et corrélation calculées sur toutes les lignes
+        plot_df = clean_df.sample(n=min(500, len(clean_df)), random_state=0)
         
-        ax.scatter(plot_df[col1], plot_df[col2], alpha=0.6, s=50, color='#667eea', edgecolors='black', linewidth=0.5)
+        x = clean_df[col1].to_numpy(dtype=float)
+        y = clean_df[col2].to_numpy(dtype=float)
+        x_plot = plot_df[col1].to_numpy(dtype=float)
         
-        z = np.polyfit(plot_df[col1], plot_df[col2], 1)
-        p = np.poly1d(z)
-        ax.plot(plot_df[col1].sort_values(), p(plot_df[col1].sort_values()), 
-               "r--", linewidth=2, label=f'Trend: y={z[0]:.2f}x+{z[1]:.2f}')
+        ax.scatter(x_plot, plot_df[col2].to_numpy(dtype=float), alpha=0.6, s=50, color='#667eea', edgecolors='black', linewidth=0.5)
+        
+        # Droite des moindres carrés (équivalent de polyfit degré 1)
+        A = np.column_stack([x, np.ones_like(x)])
+        slope, intercept = np.linalg.lstsq(A, y, rcond=None)[0]
+        x_sorted = np.sort(x_plot)
+        ax.plot(x_sorted, slope * x_sorted + intercept, 
+               "r--", linewidth=2, label=f'Trend: y={slope:.2f}x+{intercept:.2f}')
         
         ax.set_xlabel(col1, fontsize=12)
         ax.set_ylabel(col2, fontsize=12)
@@ -452,7 +621,8 @@ def _create_scatter_plot(df: pd.DataFrame, col1: str, col2: str, t: Dict) -> Tup
         ax.grid(True, alpha=0.3)
         ax.legend()
         
-        corr = plot_df[col1].corr(plot_df[col2])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.corrcoef(x, y)[0, 1]
         
         if pd.isna(corr) or abs(corr) < 0.001:
             strength = t['weak']
@@ -469,7 +639,6 @@ def _create_scatter_plot(df: pd.DataFrame, col1: str, col2: str, t: Dict) -> Tup
         
         interp = f"{strength} {t['correlation'].lower()} (r={corr:.2f}) {t['between']} {col1} {t['and']} {col2}"
         
-        plt.tight_layout()
         return fig, interp
         
     except Exception as e:
@@ -477,25 +646,27 @@ def _create_scatter_plot(df: pd.DataFrame, col1: str, col2: str, t: Dict) -> Tup
         return None, ""
 
 
-def _create_grouped_boxplot(df: pd.DataFrame, discrete_col: str, continuous_col: str, t: Dict) -> Tuple[plt.Figure, str]:
+def _create_grouped_boxplot(df: pd.DataFrame, discrete_col: str, continuous_col: str, t: Dict) -> Tuple[Figure, str]:
     """Crée un boxplot groupé : Variable discrète (X) vs Variable continue (Y)"""
     try:
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = _new_figure((12, 6))
         
         data_clean = df[[discrete_col, continuous_col]].dropna()
         
-        unique_values = sorted(data_clean[discrete_col].unique())
+        # Un seul passage groupby (trié) au lieu d'un masque booléen par valeur
+        groups = data_clean.groupby(discrete_col, observed=True, sort=True)[continuous_col]
+        group_sizes = groups.size()
+        unique_values = group_sizes.index.tolist()
         if len(unique_values) > 15:
-            top_values = data_clean[discrete_col].value_counts().head(15).index
-            data_clean = data_clean[data_clean[discrete_col].isin(top_values)]
-            unique_values = sorted(data_clean[discrete_col].unique())
+            top_values = set(group_sizes.nlargest(15).index)
+            unique_values = [val for val in unique_values if val in top_values]
         
+        arrays_by_value = {val: grp.to_numpy() for val, grp in groups}
         positions = range(len(unique_values))
-        data_by_group = [data_clean[data_clean[discrete_col] == val][continuous_col].values 
-                        for val in unique_values]
+        data_by_group = [_subsample(arrays_by_value[val]) for val in unique_values]
         
-        bp = ax.boxplot(data_by_group, positions=positions, patch_artist=True,
-                       labels=[f'{v:.1f}' if isinstance(v, float) else str(v) for v in unique_values])
+        bp = ax.boxplot(data_by_group, positions=positions, patch_artist=True)
+        ax.set_xticks(positions, [f'{v:.1f}' if isinstance(v, float) else str(v) for v in unique_values])
         
         for patch in bp['boxes']:
             patch.set_facecolor('#667eea')
@@ -508,10 +679,9 @@ def _create_grouped_boxplot(df: pd.DataFrame, discrete_col: str, continuous_col:
         ax.grid(True, alpha=0.3, axis='y')
         
         if len(unique_values) > 8:
-            plt.xticks(rotation=45, ha='right')
+            _rotate_xticklabels(ax)
         
-        means_by_group = [data_clean[data_clean[discrete_col] == val][continuous_col].mean() 
-                         for val in unique_values]
+        means_by_group = groups.mean().loc[unique_values].to_numpy()
         max_mean_idx = np.argmax(means_by_group)
         min_mean_idx = np.argmin(means_by_group)
         
@@ -524,7 +694,6 @@ def _create_grouped_boxplot(df: pd.DataFrame, discrete_col: str, continuous_col:
             f"({t['mean_label']}: {means_by_group[min_mean_idx]:.2f})."
         )
         
-        plt.tight_layout()
         return fig, interp
         
     except Exception as e:
@@ -532,10 +701,10 @@ def _create_grouped_boxplot(df: pd.DataFrame, discrete_col: str, continuous_col:
         return None, ""
 
 
-def _create_pie_chart(df: pd.DataFrame, col: str, t: Dict) -> Tuple[plt.Figure, str]:
+def _create_pie_chart(df: pd.DataFrame, col: str, t: Dict) -> Tuple[Figure, str]:
     """Crée un pie chart"""
     try:
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = _new_figure((10, 8))
         
         value_counts = df[col].value_counts().head(6)
         colors = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b', '#fa709a']
@@ -555,7 +724,6 @@ def _create_pie_chart(df: pd.DataFrame, col: str, t: Dict) -> Tuple[plt.Figure,
         
         interp = f"'{top_cat}' {t['dominates']} {top_pct:.1f}% {t['of_dist']}"
         
-        plt.tight_layout()
         return fig, interp
         
     except Exception as e:
@@ -563,95 +731,97 @@ def _create_pie_chart(df: pd.DataFrame, col: str, t: Dict) -> Tuple[plt.Figure,
         return None, ""
 
 
+_TRANSLATIONS_FR = {
+    'dist_title_continuous': 'Distribution des Variables Continues',
+    'dist_title_discrete': 'Distribution des Variables Discrètes',
+    'dist_desc_continuous': 'Histogrammes des variables continues avec moyenne (rouge) et médiane (vert)',
+    'dist_desc_discrete': 'Diagrammes en barres des variables discrètes montrant la fréquence de chaque valeur',
+    'value': 'Valeur',
+    'values': 'valeurs',
+    'frequency': 'Fréquence',
+    'count': 'Nombre',
+    'outlier_title': 'Détection des Valeurs Aberrantes',
+    'outlier_detected': 'Valeurs aberrantes détectées dans',
+    'outlier_action': 'Investigation recommandée',
+    'no_outliers': 'Aucune valeur aberrante significative',
+    'corr_title': 'Matrice de Corrélation',
+    'correlation': 'Corrélation',
+    'corr_insight': 'Corrélation la plus forte',
+    'strong': 'forte',
+    'moderate': 'modérée',
+    'weak': 'faible',
+    'between': 'entre',
+    'and': 'et',
+    'top': 'Top',
+    'by': 'par',
+    'for': 'pour',
+    'key_finding': 'Résultat clé',
+    'leads_with': 'domine avec',
+    'top3': 'Le top 3 représente',
+    'of_total': 'du total',
+    'relationship': 'Relation',
+    'strong_pos': 'Corrélation positive forte',
+    'moderate_pos': 'Corrélation positive modérée',
+    'moderate_neg': 'Corrélation négative modérée',
+    'strong_neg': 'Corrélation négative forte',
+    'distribution': 'Distribution',
+    'dominates': 'domine avec',
+    'of_dist': 'de la distribution',
+    'grouped_analysis': 'Analyse Groupée',
+    'grouped_insight': 'Analyse par groupe',
+    'highest': 'Valeur maximale de',
+    'lowest': 'Valeur minimale',
+    'more_variables': 'autres variables',
+    'mean_label': 'moyenne'
+}
+
+_TRANSLATIONS_EN = {
+    'dist_title_continuous': 'Continuous Variables Distribution',
+    'dist_title_discrete': 'Discrete Variables Distribution',
+    'dist_desc_continuous': 'Histograms of continuous variables with mean (red) and median (green)',
+    'dist_desc_discrete': 'Bar charts of discrete variables showing frequency of each value',
+    'value': 'Value',
+    'values': 'values',
+    'frequency': 'Frequency',
+    'count': 'Count',
+    'outlier_title': 'Outlier Detection',
+    'outlier_detected': 'Outliers detected in',
+    'outlier_action': 'Investigation recommended',
+    'no_outliers': 'No significant outliers',
+    'corr_title': 'Correlation Matrix',
+    'correlation': 'Correlation',
+    'corr_insight': 'Strongest correlation',
+    'strong': 'strong',
+    'moderate': 'moderate',
+    'weak': 'weak',
+    'between': 'between',
+    'and': 'and',
+    'top': 'Top',
+    'by': 'by',
+    'for': 'for',
+    'key_finding': 'Key finding',
+    'leads_with': 'leads with',
+    'top3': 'Top 3 represent',
+    'of_total': 'of total',
+    'relationship': 'Relationship',
+    'strong_pos': 'Strong positive correlation',
+    'moderate_pos': 'Moderate positive correlation',
+    'moderate_neg': 'Moderate negative correlation',
+    'strong_neg': 'Strong negative correlation',
+    'distribution': 'Distribution',
+    'dominates': 'dominates with',
+    'of_dist': 'of distribution',
+    'grouped_analysis': 'Grouped Analysis',
+    'grouped_insight': 'Group analysis',
+    'highest': 'Highest value of',
+    'lowest': 'Lowest value',
+    'more_variables': 'more variables',
+    'mean_label': 'mean'
+}
+
+_TRANSLATIONS = {'fr': _TRANSLATIONS_FR, 'en': _TRANSLATIONS_EN}
+
+
 def _get_translations(lang: str) -> Dict[str, str]:
-    """Retourne les traductions"""
-    translations = {
-        'fr': {
-            'dist_title_continuous': 'Distribution des Variables Continues',
-            'dist_title_discrete': 'Distribution des Variables Discrètes',
-            'dist_desc_continuous': 'Histogrammes des variables continues avec moyenne (rouge) et médiane (vert)',
-            'dist_desc_discrete': 'Diagrammes en barres des variables discrètes montrant la fréquence de chaque valeur',
-            'value': 'Valeur',
-            'values': 'valeurs',
-            'frequency': 'Fréquence',
-            'count': 'Nombre',
-            'outlier_title': 'Détection des Valeurs Aberrantes',
-            'outlier_detected': 'Valeurs aberrantes détectées dans',
-            'outlier_action': 'Investigation recommandée',
-            'no_outliers': 'Aucune valeur aberrante significative',
-            'corr_title': 'Matrice de Corrélation',
-            'correlation': 'Corrélation',
-            'corr_insight': 'Corrélation la plus forte',
-            'strong': 'forte',
-            'moderate': 'modérée',
-            'weak': 'faible',
-            'between': 'entre',
-            'and': 'et',
-            'top': 'Top',
-            'by': 'par',
-            'for': 'pour',
-            'key_finding': 'Résultat clé',
-            'leads_with': 'domine avec',
-            'top3': 'Le top 3 représente',
-            'of_total': 'du total',
-            'relationship': 'Relation',
-            'strong_pos': 'Corrélation positive forte',
-            'moderate_pos': 'Corrélation positive modérée',
-            'moderate_neg': 'Corrélation négative modérée',
-            'strong_neg': 'Corrélation négative forte',
-            'distribution': 'Distribution',
-            'dominates': 'domine avec',
-            'of_dist': 'de la distribution',
-            'grouped_analysis': 'Analyse Groupée',
-            'grouped_insight': 'Analyse par groupe',
-            'highest': 'Valeur maximale de',
-            'lowest': 'Valeur minimale',
-            'more_variables': 'autres variables',
-            'mean_label': 'moyenne'
-        },
-        'en': {
-            'dist_title_continuous': 'Continuous Variables Distribution',
-            'dist_title_discrete': 'Discrete Variables Distribution',
-            'dist_desc_continuous': 'Histograms of continuous variables with mean (red) and median (green)',
-            'dist_desc_discrete': 'Bar charts of discrete variables showing frequency of each value',
-            'value': 'Value',
-            'values': 'values',
-            'frequency': 'Frequency',
-            'count': 'Count',
-            'outlier_title': 'Outlier Detection',
-            'outlier_detected': 'Outliers detected in',
-            'outlier_action': 'Investigation recommended',
-            'no_outliers': 'No significant outliers',
-            'corr_title': 'Correlation Matrix',
-            'correlation': 'Correlation',
-            'corr_insight': 'Strongest correlation',
-            'strong': 'strong',
-            'moderate': 'moderate',
-            'weak': 'weak',
-            'between': 'between',
-            'and': 'and',
-            'top': 'Top',
-            'by': 'by',
-            'for': 'for',
-            'key_finding': 'Key finding',
-            'leads_with': 'leads with',
-            'top3': 'Top 3 represent',
-            'of_total': 'of total',
-            'relationship': 'Relationship',
-            'strong_pos': 'Strong positive correlation',
-            'moderate_pos': 'Moderate positive correlation',
-            'moderate_neg': 'Moderate negative correlation',
-            'strong_neg': 'Strong negative correlation',
-            'distribution': 'Distribution',
-            'dominates': 'dominates with',
-            'of_dist': 'of distribution',
-            'grouped_analysis': 'Grouped Analysis',
-            'grouped_insight': 'Group analysis',
-            'highest': 'Highest value of',
-            'lowest': 'Lowest value',
-            'more_variables': 'more variables',
-            'mean_label': 'mean'
-        }
-    }
-    
-    return translations.get(lang, translations['fr'])
+    """Retourne les traductions (dictionnaires partagés, ne pas modifier)"""
+    return _TRANSLATIONS.get(lang, _TRANSLATIONS_FR)